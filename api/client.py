@@ -1,6 +1,11 @@
-from typing import Any
+import asyncio
+from collections import Counter
+from typing import Any, AsyncGenerator, Dict, Hashable, Tuple
 import aiohttp
 from .exceptions import ApiClientError, ResourceNotFoundError, ApiBadRequestError
+from .streaming import JsonObjectStream
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 class ApiClient:
     def __init__(self, base_url: str, api_key: str, use_ssl: bool = True):
@@ -8,6 +13,11 @@ class ApiClient:
         self.default_headers = {'X-Api-Key': api_key, 'Content-Type': 'application/json'}
         self.use_ssl = use_ssl
         self._session: aiohttp.ClientSession | None = None
+        # Singleflight: ідентичні GET-запити, що виконуються одночасно, ділять один запит до API.
+        self._inflight: Dict[Hashable, Tuple[asyncio.Future, list[int]]] = {}
+        self._upstream_calls: Counter[str] = Counter()
+        self._coalesced_calls: Counter[str] = Counter()
+        self._max_fold: Dict[str, int] = {}
 
     async def __aenter__(self):
         """Створює сесію при вході в асинхронний контекст."""
@@ -34,21 +44,111 @@ class ApiClient:
             async with self._session.request(
                 method, url, json=data, ssl=self.use_ssl, params=params, headers=request_headers
             ) as response:
-                if 400 <= response.status < 600:
-                    message = await response.text()
-                    if response.status == 404:
-                        raise ResourceNotFoundError(response.status, message)
-                    if response.status in [400, 409]:
-                        raise ApiBadRequestError(response.status, message)
-                    raise ApiClientError(response.status, message)
-
+                await self._raise_for_status(response)
                 return await response.json() if response.status != 204 else None
 
         except aiohttp.ClientError as err:
             raise ApiClientError(status_code=500, message=str(err)) from err
 
+    @staticmethod
+    async def _raise_for_status(response: aiohttp.ClientResponse) -> None:
+        if 400 <= response.status < 600:
+            message = await response.text()
+            if response.status == 404:
+                raise ResourceNotFoundError(response.status, message)
+            if response.status in [400, 409]:
+                raise ApiBadRequestError(response.status, message)
+            raise ApiClientError(response.status, message)
+
+    async def _stream(self, endpoint: str, params: dict | None = None,
+                      extra_headers: dict | None = None) -> AsyncGenerator[bytes, None]:
+        if not self._session:
+            raise RuntimeError("ApiClient session not started. Use 'async with ApiClient(...):'")
+
+        request_headers = self.default_headers.copy()
+        if extra_headers:
+            request_headers.update(extra_headers)
+
+        try:
+            async with self._session.get(
+                self.base_url + endpoint, ssl=self.use_ssl, params=params, headers=request_headers
+            ) as response:
+                await self._raise_for_status(response)
+                if response.status == 204:
+                    return
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    yield chunk
+
+        except aiohttp.ClientError as err:
+            raise ApiClientError(status_code=500, message=str(err)) from err
+
+    async def _coalesced_request(self, method: str, endpoint: str, params: dict | None = None,
+                                 extra_headers: dict | None = None) -> Any:
+        """
+        Виконує запит так, щоб одночасні ідентичні виклики (метод, endpoint, відсортовані параметри
+        та заголовки) отримали результат одного запиту до API.
+        """
+        key = (
+            method,
+            endpoint,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((extra_headers or {}).items())),
+        )
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            future, callers = inflight
+            callers[0] += 1
+            self._coalesced_calls[endpoint] += 1
+            # shield: скасування одного з очікувачів не скасовує спільний запит для інших.
+            return await asyncio.shield(future)
+
+        callers = [1]
+        future = asyncio.ensure_future(
+            self._request(method, endpoint, params=params, extra_headers=extra_headers)
+        )
+        self._inflight[key] = (future, callers)
+        self._upstream_calls[endpoint] += 1
+
+        def _release(_: asyncio.Future) -> None:
+            self._inflight.pop(key, None)
+            if callers[0] > self._max_fold.get(endpoint, 0):
+                self._max_fold[endpoint] = callers[0]
+            if future.cancelled():
+                return
+            # Позначаємо виняток як отриманий, навіть якщо всі очікувачі були скасовані.
+            future.exception()
+
+        future.add_done_callback(_release)
+        return await asyncio.shield(future)
+
+    def get_coalescing_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Повертає статистику об'єднання GET-запитів по кожному endpoint:
+        кількість реальних запитів до API, кількість об'єднаних викликів,
+        середню та максимальну кількість викликів на один запит.
+        """
+        stats = {}
+        for endpoint, upstream in self._upstream_calls.items():
+            coalesced = self._coalesced_calls.get(endpoint, 0)
+            stats[endpoint] = {
+                'upstream_calls': upstream,
+                'coalesced_calls': coalesced,
+                'avg_callers_per_call': (upstream + coalesced) / upstream,
+                'max_callers_per_call': self._max_fold.get(endpoint, 1),
+            }
+        return stats
+
     async def get(self, endpoint: str, params: dict | None = None, extra_headers: dict | None = None) -> Any:
-        return await self._request('GET', endpoint, params=params, extra_headers=extra_headers)
+        return await self._coalesced_request('GET', endpoint, params=params, extra_headers=extra_headers)
+
+    def stream_json(self, endpoint: str, array_key: str, params: dict | None = None,
+                    extra_headers: dict | None = None) -> JsonObjectStream:
+        """
+        Виконує GET-запит, відповідь якого розбирається потоково: елементи масиву array_key
+        стають доступними ще до завершення завантаження. Запит виконується при першому читанні.
+        """
+        return JsonObjectStream(self._stream(endpoint, params=params, extra_headers=extra_headers), array_key)
 
     async def post(self, endpoint: str, data: dict, extra_headers: dict | None = None) -> Any:
         return await self._request('POST', endpoint, data=data, extra_headers=extra_headers)
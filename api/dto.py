@@ -112,5 +112,4 @@ class UserBroadcastTargetDTO(BaseModel):
 
 class PendingBroadcastDTO(BaseModel):
     id: int
-    message_text: str = Field(alias='messageText')
-    users: list[UserBroadcastTargetDTO]
\ No newline at end of file
+    message_text: str = Field(alias='messageText')
\ No newline at end of file
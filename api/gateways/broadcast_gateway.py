@@ -1,5 +1,6 @@
 from typing import Any
 from api.client import ApiClient
+from api.streaming import JsonObjectStream
 
 class BroadcastGateway:
     def __init__(self, client: ApiClient):
@@ -20,10 +21,13 @@ class BroadcastGateway:
         
         return await self._client.post('/api/broadcast', data=data, extra_headers=headers)
     
-    async def get_pending_broadcast(self, admin_api_key: str) -> Any:
-        """Отримує одне активне завдання на розсилку, яке ще не було надіслано."""
+    def stream_pending_broadcast(self, admin_api_key: str) -> JsonObjectStream:
+        """
+        Отримує одне активне завдання на розсилку, яке ще не було надіслано.
+        Список отримувачів (поле users) читається потоково, в міру надходження відповіді.
+        """
         headers = {'X-Admin-Api-Key': admin_api_key}
-        return await self._client.get('/api/notification/pending-broadcast', extra_headers=headers)
+        return self._client.stream_json('/api/notification/pending-broadcast', array_key='users', extra_headers=headers)
     
     async def mark_broadcast_as_sent(self, broadcast_id: int, admin_api_key: str) -> None:
         """Позначає завдання на розсилку як виконане."""
@@ -0,0 +1,240 @@
+import codecs
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterator, Deque, Dict, Tuple
+
+from .exceptions import ApiClientError
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = ' \t\n\r'
+_MISSING: Any = object()
+
+# Стани розбору JSON-об'єкта верхнього рівня.
+_EXPECT_OBJECT = 'object'
+_EXPECT_KEY = 'key'
+_EXPECT_COLON = 'colon'
+_EXPECT_VALUE = 'value'
+_AFTER_VALUE = 'after_value'
+_ARRAY_START = 'array_start'
+_EXPECT_ITEM = 'item'
+_AFTER_ITEM = 'after_item'
+_DONE = 'done'
+
+# Події розбору.
+FIELD = 'field'
+ITEM = 'item'
+ARRAY_END = 'array_end'
+
+Event = Tuple[str, Any, Any]
+
+
+class IncrementalJsonObjectParser:
+    """
+    Інкрементальний розбір JSON-об'єкта верхнього рівня, що надходить частинами.
+    Елементи масиву з ключем array_key повертаються по одному в міру надходження,
+    решта полів — цілими значеннями. Дані, що вже розібрано, не зберігаються.
+    """
+    def __init__(self, array_key: str):
+        self._array_key = array_key
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _EXPECT_OBJECT
+        self._key: str | None = None
+
+    def feed(self, chunk: bytes, final: bool = False) -> None:
+        """Додає наступну частину тіла відповіді."""
+        text = self._utf8.decode(chunk, final)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
+    def next_event(self, final: bool = False) -> Event | None:
+        """
+        Повертає наступну подію (FIELD, ключ, значення), (ITEM, ключ, елемент) або (ARRAY_END, ключ, None).
+        Повертає None, якщо для наступної події потрібно більше даних або об'єкт закінчився.
+        :param final: True, якщо більше даних не буде.
+        """
+        while True:
+            char = self._skip_whitespace()
+            if char is None:
+                if final and self._state not in (_DONE, _EXPECT_OBJECT):
+                    self._error("Unexpected end of JSON stream")
+                return None
+
+            state = self._state
+            if state == _EXPECT_OBJECT:
+                if char != '{':
+                    # Порожня відповідь (null) означає відсутність даних.
+                    value = self._decode(final)
+                    if value is _MISSING:
+                        return None
+                    if value is not None:
+                        self._error("Expected a JSON object")
+                    self._state = _DONE
+                    return None
+                self._pos += 1
+                self._state = _EXPECT_KEY
+
+            elif state == _EXPECT_KEY:
+                if char == '}':
+                    self._pos += 1
+                    self._state = _DONE
+                    return None
+                if char != '"':
+                    self._error("Expected an object key")
+                key = self._decode(final)
+                if key is _MISSING:
+                    return None
+                self._key = key
+                self._state = _EXPECT_COLON
+
+            elif state == _EXPECT_COLON:
+                self._expect(char, ':')
+                self._state = _EXPECT_VALUE
+
+            elif state == _EXPECT_VALUE:
+                if self._key == self._array_key and char == '[':
+                    self._pos += 1
+                    self._state = _ARRAY_START
+                    continue
+                value = self._decode(final)
+                if value is _MISSING:
+                    return None
+                self._state = _AFTER_VALUE
+                return FIELD, self._key, value
+
+            elif state == _AFTER_VALUE:
+                if char == '}':
+                    self._pos += 1
+                    self._state = _DONE
+                    return None
+                self._expect(char, ',')
+                self._state = _EXPECT_KEY
+
+            elif state in (_ARRAY_START, _EXPECT_ITEM):
+                if state == _ARRAY_START and char == ']':
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                    return ARRAY_END, self._key, None
+                item = self._decode(final)
+                if item is _MISSING:
+                    return None
+                self._state = _AFTER_ITEM
+                return ITEM, self._key, item
+
+            elif state == _AFTER_ITEM:
+                if char == ']':
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                    return ARRAY_END, self._key, None
+                self._expect(char, ',')
+                self._state = _EXPECT_ITEM
+
+            else:
+                self._error("Unexpected data after the end of JSON object")
+
+    def _skip_whitespace(self) -> str | None:
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _decode(self, final: bool) -> Any:
+        """Розбирає одне значення з поточної позиції або повертає _MISSING, якщо воно ще не надійшло повністю."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _MISSING
+        # Число в кінці буфера могло обірватися на межі частин — чекаємо наступну частину.
+        if end == len(self._buffer) and not final:
+            return _MISSING
+        self._pos = end
+        return value
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char != expected:
+            self._error(f"Expected '{expected}'")
+        self._pos += 1
+
+    def _error(self, message: str) -> None:
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
+
+
+class JsonObjectStream:
+    """
+    Потоково читає JSON-об'єкт з великим масивом (наприклад, список отримувачів розсилки):
+    поля об'єкта доступні через read_fields(), а елементи масиву — через items(), без завантаження
+    всієї відповіді в пам'ять. Закривати через `async with` або aclose().
+    """
+    def __init__(self, chunks: AsyncGenerator[bytes, None], array_key: str):
+        self.fields: Dict[str, Any] = {}
+        self._chunks = chunks
+        self._parser = IncrementalJsonObjectParser(array_key)
+        self._array_key = array_key
+        self._exhausted = False
+        self._buffered_items: Deque[Any] = deque()
+
+    async def __aenter__(self) -> "JsonObjectStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Закриває з'єднання, навіть якщо відповідь прочитано не повністю."""
+        await self._chunks.aclose()
+
+    async def _next_event(self) -> Event | None:
+        try:
+            while True:
+                event = self._parser.next_event(final=self._exhausted)
+                if event is not None or self._exhausted:
+                    return event
+                try:
+                    chunk = await self._chunks.__anext__()
+                except StopAsyncIteration:
+                    self._exhausted = True
+                    self._parser.feed(b'', final=True)
+                    continue
+                self._parser.feed(chunk)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ApiClientError(status_code=500, message=f"Malformed JSON stream: {e}") from e
+
+    async def read_fields(self, *names: str) -> Dict[str, Any]:
+        """
+        Читає поля об'єкта, доки не буде отримано всі вказані (або до кінця об'єкта).
+        Якщо якесь поле йде у відповіді після масиву, елементи масиву, прочитані до нього,
+        тимчасово зберігаються в пам'яті.
+        """
+        warned = False
+        while any(name not in self.fields for name in names):
+            event = await self._next_event()
+            if event is None:
+                break
+            kind, key, value = event
+            if kind == FIELD:
+                self.fields[key] = value
+            elif kind == ITEM:
+                if not warned:
+                    logger.warning("Field(s) %s follow '%s' in the response; buffering array items", names, self._array_key)
+                    warned = True
+                self._buffered_items.append(value)
+        return self.fields
+
+    async def items(self) -> AsyncIterator[Any]:
+        """Повертає елементи масиву в міру надходження; поля після масиву зберігаються в fields."""
+        while self._buffered_items:
+            yield self._buffered_items.popleft()
+
+        while (event := await self._next_event()) is not None:
+            kind, key, value = event
+            if kind == FIELD:
+                self.fields[key] = value
+            elif kind == ITEM:
+                yield value
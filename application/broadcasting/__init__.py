@@ -0,0 +1,24 @@
+from .dispatcher import BroadcastDispatcher
+from .health import RecipientHealthStore
+from .journal import DeliveryJournal, shard_of
+from .lease import BroadcastLease, BroadcastLeaseUnavailable
+from .progress import ProgressCallback, report_progress
+from .rate_limiter import TokenBucket
+from .sender import BroadcastSender, BroadcastStats
+from .workers import BroadcastWorkerError, ShardedBroadcastRunner
+
+__all__ = [
+    'BroadcastDispatcher',
+    'BroadcastLease',
+    'BroadcastLeaseUnavailable',
+    'DeliveryJournal',
+    'RecipientHealthStore',
+    'ProgressCallback',
+    'report_progress',
+    'TokenBucket',
+    'BroadcastSender',
+    'BroadcastStats',
+    'BroadcastWorkerError',
+    'ShardedBroadcastRunner',
+    'shard_of'
+]
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from aiogram import Bot
+
+from api.exceptions import ApiClientError
+from .lease import BroadcastLeaseUnavailable
+from .workers import BroadcastWorkerError
+
+if TYPE_CHECKING:
+    from application.services import BroadcastService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_POLL_INTERVAL_SECONDS = 15
+DEFAULT_MAX_POLL_INTERVAL_SECONDS = 300
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 10
+
+
+class BroadcastDispatcher:
+    """
+    Фонова задача, що опитує API на наявність розсилок, час яких настав, і виконує їх.
+    Якщо розсилок немає або API повертає помилку, інтервал опитування подвоюється (до max_poll_interval);
+    після успішно виконаної розсилки наступна перевіряється одразу.
+    """
+    def __init__(
+        self,
+        broadcast_service: "BroadcastService",
+        bot: Bot,
+        min_poll_interval: float = DEFAULT_MIN_POLL_INTERVAL_SECONDS,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL_SECONDS
+    ):
+        self._broadcast_service = broadcast_service
+        self._bot = bot
+        self._min_poll_interval = min_poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info("Broadcast dispatcher started.")
+
+    async def stop(self, drain_timeout: float = DEFAULT_DRAIN_TIMEOUT_SECONDS) -> None:
+        """
+        Зупиняє опитування. Поточній розсилці дається drain_timeout секунд на завершення,
+        після чого її буде перервано — прогрес збережено в журналі доставки, і наступний запуск її продовжить.
+        """
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Broadcast did not finish within %ss, interrupting; progress is kept in the journal.", drain_timeout)
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        finally:
+            self._task = None
+        logger.info("Broadcast dispatcher stopped.")
+
+    async def _run(self) -> None:
+        interval = self._min_poll_interval
+        while not self._stopping.is_set():
+            try:
+                stats = await self._broadcast_service.run_pending_broadcast(self._bot)
+            except ApiClientError as e:
+                logger.warning("Failed to poll pending broadcasts: %s", e)
+                stats = None
+            except BroadcastLeaseUnavailable as e:
+                logger.info("Skipping broadcast poll: %s", e)
+                stats = None
+            except BroadcastWorkerError as e:
+                logger.error("Broadcast interrupted, will resume on the next poll: %s", e)
+                stats = None
+            except Exception:
+                logger.exception("Unexpected error in broadcast dispatcher")
+                stats = None
+
+            if stats is not None and stats.marked_as_sent:
+                interval = self._min_poll_interval
+                continue
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            interval = min(interval * 2, self._max_poll_interval)
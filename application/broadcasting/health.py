@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Помилки TelegramBadRequest, після яких повідомлення цьому отримувачу вже ніколи не буде доставлено.
+PERMANENT_BAD_REQUEST_MARKERS = ('chat not found', 'user is deactivated', 'peer_id_invalid')
+
+
+def is_permanent_bad_request(message: str) -> bool:
+    lowered = message.lower()
+    return any(marker in lowered for marker in PERMANENT_BAD_REQUEST_MARKERS)
+
+
+class RecipientFailure:
+    """Остання постійна помилка доставки одному отримувачу."""
+    def __init__(self, reason: str, failed_at: float):
+        self.reason = reason
+        self.failures = 1
+        self.first_failed_at = failed_at
+        self.last_failed_at = failed_at
+
+
+class RecipientHealthStore:
+    """
+    Локальний журнал недоступних отримувачів розсилок (заблокували бота, видалили акаунт тощо).
+    Такі отримувачі пропускаються в наступних розсилках і не витрачають ліміт Telegram.
+    Файл формату JSON Lines лише дописується, тож ним можуть користуватися одночасно кілька
+    процесів-виконавців розсилки; поточний стан — результат відтворення всіх записів.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._failures: Dict[int, RecipientFailure] = {}
+
+    def __contains__(self, telegram_id: int) -> bool:
+        return telegram_id in self._failures
+
+    def __len__(self) -> int:
+        return len(self._failures)
+
+    def load(self) -> "RecipientHealthStore":
+        """(Пере)читає журнал з диска."""
+        self._failures.clear()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        # Обірваний останній рядок після аварійної зупинки.
+                        continue
+        except FileNotFoundError:
+            pass
+        return self
+
+    def _apply(self, record: dict) -> None:
+        telegram_id = int(record['id'])
+        if record.get('reachable'):
+            self._failures.pop(telegram_id, None)
+            return
+
+        failure = self._failures.get(telegram_id)
+        if failure is None:
+            self._failures[telegram_id] = RecipientFailure(record['reason'], record['at'])
+        else:
+            failure.reason = record['reason']
+            failure.failures += 1
+            failure.last_failed_at = record['at']
+
+    def _append(self, record: dict) -> None:
+        self._apply(record)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.error("Could not write to recipient health store %s: %s", self.path, e)
+
+    def record_failure(self, telegram_id: int, reason: str) -> None:
+        """Позначає отримувача як недоступного."""
+        self._append({'id': telegram_id, 'reason': reason, 'at': time.time()})
+
+    def mark_reachable(self, telegram_id: int) -> None:
+        """Знімає позначку, якщо користувач знову взаємодіє з ботом (наприклад, розблокував його)."""
+        if telegram_id in self._failures:
+            self._append({'id': telegram_id, 'reachable': True, 'at': time.time()})
+
+    def failures(self) -> List[Tuple[int, RecipientFailure]]:
+        return sorted(self._failures.items())
+
+    def export_csv(self) -> str:
+        """Повертає список недоступних отримувачів у форматі CSV для очищення на бекенді."""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['telegram_id', 'reason', 'failures', 'first_failed_at', 'last_failed_at'])
+        for telegram_id, failure in self.failures():
+            writer.writerow([
+                telegram_id,
+                failure.reason,
+                failure.failures,
+                _format_timestamp(failure.first_failed_at),
+                _format_timestamp(failure.last_failed_at),
+            ])
+        return output.getvalue()
+
+
+def _format_timestamp(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
@@ -0,0 +1,76 @@
+import logging
+import os
+from typing import Set, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(telegram_id: int, shard_count: int) -> int:
+    """Номер шарду отримувача, до якого його відносить процес-виконавець розсилки."""
+    return telegram_id % shard_count
+
+
+class DeliveryJournal:
+    """
+    Локальний append-only журнал доставки однієї розсилки: по одному telegram_id на рядок.
+    Дозволяє після перезапуску продовжити розсилку, пропустивши вже оброблених отримувачів.
+    Журнал один на розсилку незалежно від кількості процесів-виконавців: вони дописують у той самий файл
+    (кожен запис — один короткий write у режимі 'a'), тож зміна broadcast_worker_count між
+    аварійною зупинкою та перезапуском не втрачає вже зроблену роботу.
+    """
+    def __init__(self, directory: str, broadcast_id: int, shard: Tuple[int, int] | None = None):
+        """
+        :param shard: Пара (номер шарду, кількість шардів) для процесу-виконавця: з журналу
+            зчитуються лише отримувачі цього шарду.
+        """
+        self.path = os.path.join(directory, f"broadcast_{broadcast_id}.journal")
+        self._directory = directory
+        self._shard = shard
+        self._delivered: Set[int] = set()
+        self._file: TextIO | None = None
+
+    def __contains__(self, telegram_id: int) -> bool:
+        return telegram_id in self._delivered
+
+    def __len__(self) -> int:
+        return len(self._delivered)
+
+    def open(self) -> "DeliveryJournal":
+        """Зчитує вже записаних отримувачів і відкриває журнал на дозапис."""
+        os.makedirs(self._directory, exist_ok=True)
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        telegram_id = int(line)
+                    except ValueError:
+                        # Обірваний рядок після аварійної зупинки.
+                        continue
+                    if self._shard is None or shard_of(telegram_id, self._shard[1]) == self._shard[0]:
+                        self._delivered.add(telegram_id)
+            if self._delivered:
+                logger.info("Resuming broadcast from %s: %d recipients already processed", self.path, len(self._delivered))
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def record(self, telegram_id: int) -> None:
+        """Записує отримувача як обробленого; запис одразу скидається на диск."""
+        if self._file is None:
+            raise RuntimeError("DeliveryJournal is not open")
+        self._delivered.add(telegram_id)
+        self._file.write(f"{telegram_id}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Закриває та видаляє журнал (коли розсилку позначено як виконану)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import LockError, RedisError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_TTL_SECONDS = 60
+
+
+class BroadcastLeaseUnavailable(Exception):
+    """Розсилку зараз виконує інша репліка бота (або Redis недоступний), тож ця репліка її не запускає."""
+
+
+class BroadcastLease:
+    """
+    Оренда права виконувати розсилки, спільна для всіх реплік бота (замок у Redis).
+    Поки розсилка триває, оренда продовжується у фоні; якщо репліка аварійно зупиниться,
+    оренда звільниться сама після закінчення TTL.
+    """
+    def __init__(self, redis: Redis, key: str, ttl: float = DEFAULT_LEASE_TTL_SECONDS):
+        self._lock = redis.lock(key, timeout=ttl)
+        self._ttl = ttl
+        self._renewal: asyncio.Task | None = None
+
+    async def acquire(self) -> None:
+        """Бере оренду або піднімає BroadcastLeaseUnavailable, якщо вона зайнята."""
+        try:
+            acquired = await self._lock.acquire(blocking=False)
+        except RedisError as e:
+            raise BroadcastLeaseUnavailable(f"Could not reach Redis to take the broadcast lease: {e}") from e
+        if not acquired:
+            raise BroadcastLeaseUnavailable("Another replica is running a broadcast")
+        self._renewal = asyncio.create_task(self._renew())
+
+    async def release(self) -> None:
+        if self._renewal is not None:
+            self._renewal.cancel()
+            await asyncio.gather(self._renewal, return_exceptions=True)
+            self._renewal = None
+        try:
+            await self._lock.release()
+        except (LockError, RedisError) as e:
+            # Оренда могла вже закінчитися; тоді вона звільниться сама.
+            logger.warning("Could not release the broadcast lease: %s", e)
+
+    async def _renew(self) -> None:
+        while True:
+            await asyncio.sleep(self._ttl / 3)
+            try:
+                await self._lock.extend(self._ttl, replace_ttl=True)
+            except LockError:
+                logger.error("Broadcast lease was lost; another replica may start the same broadcast")
+                return
+            except RedisError as e:
+                logger.warning("Could not renew the broadcast lease: %s", e)
@@ -0,0 +1,26 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from .sender import BroadcastStats
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[BroadcastStats], Awaitable[None]]
+
+# Telegram обмежує частоту редагування повідомлень, тому прогрес показується не частіше ніж раз на кілька секунд.
+DEFAULT_PROGRESS_INTERVAL_SECONDS = 3.0
+
+
+async def report_progress(
+    stats: BroadcastStats,
+    callback: ProgressCallback,
+    interval_seconds: float = DEFAULT_PROGRESS_INTERVAL_SECONDS
+) -> None:
+    """Періодично передає поточну статистику розсилки в callback, доки задачу не буде скасовано."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await callback(stats)
+        except Exception:
+            logger.exception("Broadcast progress callback failed")
@@ -0,0 +1,54 @@
+import asyncio
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    Асинхронний token bucket: не більше rate операцій на секунду з допустимим сплеском capacity.
+    Очікувачі обслуговуються в порядку черги. pause() зупиняє видачу токенів для всіх (наприклад, на RetryAfter).
+    """
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else rate
+        self._tokens = self._capacity
+        self._updated_at = monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def paused_for(self) -> float:
+        """Скільки секунд ще триває пауза (0, якщо паузи немає)."""
+        return max(self._paused_until - monotonic(), 0.0)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Чекає, доки з'явиться токен, і забирає його."""
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def pause(self, seconds: float) -> None:
+        """Зупиняє видачу токенів на вказаний час і скидає накопичений запас."""
+        now = monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+        self._updated_at = max(now, self._paused_until)
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import AsyncIterable, Dict, Iterable
+
+from aiogram import Bot
+from aiogram.exceptions import (TelegramBadRequest, TelegramForbiddenError,
+                                TelegramRetryAfter)
+
+from .health import RecipientHealthStore, is_permanent_bad_request
+from .journal import DeliveryJournal
+from .rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Загальний ліміт Telegram — близько 30 повідомлень на секунду; залишаємо невеликий запас.
+DEFAULT_RATE_PER_SECOND = 28
+DEFAULT_CONCURRENCY = 20
+MAX_RETRY_AFTER_ATTEMPTS = 3
+
+
+class BroadcastStats:
+    """Лічильники однієї розсилки. Оновлюються під час відправки, тож їх можна читати як прогрес."""
+    COUNTERS = ('queued', 'sent', 'failed', 'blocked', 'rate_limited', 'skipped', 'unreachable')
+
+    def __init__(self):
+        self.broadcast_id: int | None = None
+        self.marked_as_sent = False
+        self.queued = 0
+        self.sent = 0
+        self.failed = 0
+        self.blocked = 0
+        self.rate_limited = 0
+        self.skipped = 0
+        # Пропущені отримувачі, яким раніше вже не вдалося доставити повідомлення назавжди.
+        self.unreachable = 0
+        # Загальна кількість отримувачів стає відомою, коли список прочитано до кінця.
+        self.total: int | None = None
+        self.paused_until = 0.0
+        self.started_at = monotonic()
+        self.finished_at: float | None = None
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed + self.blocked
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Кількість успішно надісланих повідомлень за секунду."""
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def paused_for(self) -> float:
+        """Скільки секунд ще триває пауза через ліміт Telegram (0, якщо паузи немає)."""
+        return max(self.paused_until - monotonic(), 0.0)
+
+    @property
+    def eta(self) -> float | None:
+        """Орієнтовний час до завершення в секундах або None, якщо його ще неможливо оцінити."""
+        if self.total is None or self.processed == 0:
+            return None
+        remaining = max(self.total - self.processed - self.skipped - self.unreachable, 0)
+        return remaining * self.elapsed / self.processed + self.paused_for
+
+    def counters(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+
+class BroadcastSender:
+    """
+    Надсилає одне повідомлення багатьом отримувачам з обмеженою паралельністю.
+    Швидкість обмежується спільним token bucket під глобальний ліміт Telegram, а при
+    TelegramRetryAfter пауза застосовується до всього bucket, а не лише до одного запиту.
+    """
+    def __init__(
+        self,
+        bot: Bot,
+        rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+        concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        self._bot = bot
+        # Без сплесків: рівномірний темп, щоб не перевищити ліміт у жодному секундному вікні.
+        self._bucket = TokenBucket(rate=rate_per_second, capacity=1)
+        self._concurrency = concurrency
+
+    async def send(
+        self,
+        message_text: str,
+        recipients: Iterable[int] | AsyncIterable[int],
+        journal: DeliveryJournal | None = None,
+        stats: BroadcastStats | None = None,
+        health: RecipientHealthStore | None = None
+    ) -> BroadcastStats:
+        """
+        Надсилає повідомлення всім отримувачам і повертає статистику.
+        Якщо передано journal, вже записаних у ньому отримувачів буде пропущено, а кожна успішна
+        або остаточно неуспішна відправка записується до журналу.
+        Якщо передано stats, лічильники оновлюються в ньому, тож прогрес можна читати під час розсилки.
+        Якщо передано health, відомі недоступні отримувачі пропускаються, а нові постійні помилки записуються туди.
+        """
+        stats = stats or BroadcastStats()
+        queue: asyncio.Queue[int | None] = asyncio.Queue(maxsize=self._concurrency * 2)
+
+        workers = [
+            asyncio.create_task(self._worker(queue, message_text, stats, journal, health))
+            for _ in range(self._concurrency)
+        ]
+        producer = asyncio.create_task(self._produce(recipients, queue, stats, len(workers)))
+        try:
+            # Якщо всі виконавці впадуть, producer інакше чекав би на місце в заповненій черзі вічно.
+            done, _ = await asyncio.wait([producer, *workers], return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                error = None if task.cancelled() else task.exception()
+                if error is not None:
+                    raise error
+        finally:
+            producer.cancel()
+            for worker in workers:
+                worker.cancel()
+            stats.finished_at = monotonic()
+
+        logger.info(
+            "Broadcast finished: %d sent, %d failed, %d blocked, %d skipped, %d unreachable, %d rate limits in %.1fs (%.1f msg/s)",
+            stats.sent, stats.failed, stats.blocked, stats.skipped, stats.unreachable, stats.rate_limited,
+            stats.elapsed, stats.throughput
+        )
+        return stats
+
+    @staticmethod
+    async def _produce(
+        recipients: Iterable[int] | AsyncIterable[int],
+        queue: asyncio.Queue,
+        stats: BroadcastStats,
+        worker_count: int
+    ) -> None:
+        if isinstance(recipients, AsyncIterable):
+            async for telegram_id in recipients:
+                stats.queued += 1
+                await queue.put(telegram_id)
+        else:
+            for telegram_id in recipients:
+                stats.queued += 1
+                await queue.put(telegram_id)
+        stats.total = stats.queued
+
+        for _ in range(worker_count):
+            await queue.put(None)
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue,
+        message_text: str,
+        stats: BroadcastStats,
+        journal: DeliveryJournal | None,
+        health: RecipientHealthStore | None
+    ) -> None:
+        while True:
+            telegram_id = await queue.get()
+            if telegram_id is None:
+                return
+
+            if journal is not None and telegram_id in journal:
+                stats.skipped += 1
+                continue
+
+            if health is not None and telegram_id in health:
+                stats.unreachable += 1
+                continue
+
+            if await self._send_one(telegram_id, message_text, stats, health) and journal is not None:
+                journal.record(telegram_id)
+
+    async def _send_one(
+        self,
+        telegram_id: int,
+        message_text: str,
+        stats: BroadcastStats,
+        health: RecipientHealthStore | None
+    ) -> bool:
+        """
+        Надсилає повідомлення одному отримувачу.
+        Повертає True, якщо отримувача оброблено остаточно (надіслано або його не можна досягти),
+        і False для тимчасових помилок, які варто повторити в наступному запуску.
+        """
+        for _ in range(MAX_RETRY_AFTER_ATTEMPTS):
+            await self._bucket.acquire()
+            try:
+                await self._bot.send_message(chat_id=telegram_id, text=message_text, parse_mode="HTML")
+                stats.sent += 1
+                return True
+            except TelegramRetryAfter as e:
+                stats.rate_limited += 1
+                logger.warning("Flood limit hit, pausing broadcast for %ds", e.retry_after)
+                self._bucket.pause(e.retry_after)
+                stats.paused_until = max(stats.paused_until, monotonic() + e.retry_after)
+            except TelegramForbiddenError as e:
+                logger.info("User %d blocked the bot: %s", telegram_id, e)
+                stats.blocked += 1
+                if health is not None:
+                    health.record_failure(telegram_id, e.message)
+                return True
+            except TelegramBadRequest as e:
+                logger.warning("Failed to send broadcast to user %d: %s", telegram_id, e)
+                stats.failed += 1
+                if health is not None and is_permanent_bad_request(e.message):
+                    health.record_failure(telegram_id, e.message)
+                return True
+            except Exception:
+                logger.exception("Unexpected error sending to user %d", telegram_id)
+                stats.failed += 1
+                return False
+
+        logger.warning("Giving up on user %d after %d flood limits", telegram_id, MAX_RETRY_AFTER_ATTEMPTS)
+        stats.failed += 1
+        return False
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from time import monotonic
+from typing import Any, Dict, List
+
+from .sender import BroadcastStats
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).resolve().parents[2] / 'broadcast_worker.py'
+# Як часто виконавці звітують про прогрес.
+PROGRESS_INTERVAL_SECONDS = 2.0
+WORKER_TERMINATE_TIMEOUT_SECONDS = 10
+
+
+class BroadcastWorkerError(Exception):
+    """Один або кілька процесів-виконавців розсилки завершилися з помилкою."""
+
+
+class ShardedBroadcastRunner:
+    """
+    Виконує розсилку кількома окремими процесами (broadcast_worker.py), кожен з яких обробляє свій шард
+    отримувачів і ділить між собою глобальний ліміт швидкості. Прогрес виконавців надходить рядками JSON
+    через stdout і зводиться в один BroadcastStats.
+    """
+    def __init__(self, worker_count: int):
+        if worker_count < 1:
+            raise ValueError("worker_count must be positive")
+        self._worker_count = worker_count
+
+    async def run(self, broadcast_id: int, stats: BroadcastStats | None = None) -> BroadcastStats:
+        """
+        Запускає виконавців і чекає на їх завершення. Якщо хоча б один шард завершився помилкою,
+        викидає BroadcastWorkerError — журнали шардів дозволять продовжити розсилку наступним запуском.
+        """
+        stats = stats or BroadcastStats()
+        shard_reports: List[Dict[str, Any]] = [{} for _ in range(self._worker_count)]
+        processes = [await self._spawn(broadcast_id, shard) for shard in range(self._worker_count)]
+
+        try:
+            exit_codes = await asyncio.gather(*(
+                self._follow(process, shard, shard_reports, stats)
+                for shard, process in enumerate(processes)
+            ))
+        finally:
+            await asyncio.gather(*(self._terminate(process) for process in processes))
+            stats.finished_at = monotonic()
+
+        failed_shards = [shard for shard, code in enumerate(exit_codes) if code != 0]
+        if failed_shards:
+            raise BroadcastWorkerError(f"Broadcast #{broadcast_id} workers failed for shards {failed_shards}")
+
+        logger.info(
+            "Sharded broadcast #%d finished with %d workers: %d sent, %d failed, %d blocked, %d skipped in %.1fs",
+            broadcast_id, self._worker_count, stats.sent, stats.failed, stats.blocked, stats.skipped, stats.elapsed
+        )
+        return stats
+
+    async def _spawn(self, broadcast_id: int, shard: int) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            sys.executable, str(WORKER_SCRIPT),
+            '--broadcast-id', str(broadcast_id),
+            '--shard', str(shard),
+            '--shards', str(self._worker_count),
+            stdout=asyncio.subprocess.PIPE
+        )
+
+    async def _follow(
+        self,
+        process: asyncio.subprocess.Process,
+        shard: int,
+        shard_reports: List[Dict[str, Any]],
+        stats: BroadcastStats
+    ) -> int:
+        """Читає звіти виконавця, оновлює зведену статистику та повертає код завершення процесу."""
+        assert process.stdout is not None
+        async for line in process.stdout:
+            try:
+                shard_reports[shard] = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._aggregate(shard_reports, stats)
+
+        code = await process.wait()
+        if code != 0:
+            logger.error("Broadcast worker for shard %d exited with code %d", shard, code)
+        return code
+
+    @staticmethod
+    def _aggregate(shard_reports: List[Dict[str, Any]], stats: BroadcastStats) -> None:
+        for name in BroadcastStats.COUNTERS:
+            setattr(stats, name, sum(report.get('counters', {}).get(name, 0) for report in shard_reports))
+
+        # Загальна кількість відома, лише коли кожен виконавець дочитав свій список отримувачів.
+        totals: List[int] = [int(report['total']) for report in shard_reports if report.get('total') is not None]
+        stats.total = sum(totals) if len(totals) == len(shard_reports) else None
+        paused_for = max(report.get('paused_for', 0) for report in shard_reports)
+        if paused_for:
+            stats.paused_until = max(stats.paused_until, monotonic() + paused_for)
+
+    async def _terminate(self, process: asyncio.subprocess.Process) -> None:
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=WORKER_TERMINATE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
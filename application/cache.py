@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Tuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+DEFAULT_TTL_SECONDS = 3600  # 1 година
+DEFAULT_TTL_JITTER = 0.1  # ±10%, щоб записи, завантажені разом, не застарівали одночасно
+# Пауза перед повторною спробою фонового оновлення після помилки, поки віддаються застарілі дані.
+STALE_REFRESH_RETRY_SECONDS = 30
+
+_MISSING: Any = object()
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Обмежений за розміром кеш з TTL для кожного запису та витісненням за принципом LRU.
+    Використовує монотонний годинник, тому не залежить від змін системного часу.
+    """
+    def __init__(self, max_size: int, default_ttl: float, name: str = "cache", sweep_interval: float | None = None):
+        """
+        :param sweep_interval: Якщо задано, не частіше ніж раз на цей інтервал під час запису
+                               з кешу видаляються всі прострочені записи.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.name = name
+        self._max_size = max_size
+        self._default_ttl = default_ttl
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+        self._data: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        """Перевіряє наявність актуального запису, не впливаючи на статистику та порядок LRU."""
+        entry = self._data.get(key)  # type: ignore[arg-type]
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        """Повертає значення за ключем або default, якщо запису немає чи він застарів."""
+        entry = self._data.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._expirations += 1
+            self._misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def peek(self, key: K, default: Any = None) -> V | Any:
+        """
+        Повертає значення навіть із простроченим TTL (якщо запис ще не видалено),
+        не впливаючи на статистику та порядок LRU.
+        """
+        entry = self._data.get(key)
+        return default if entry is None else entry[0]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Зберігає значення з вказаним (або типовим) TTL, витісняючи найдавніше використані записи."""
+        now = time.monotonic()
+        if self._sweep_interval is not None and now - self._last_sweep >= self._sweep_interval:
+            self.purge_expired()
+
+        expires_at = now + (self._default_ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def pop(self, key: K) -> None:
+        """Видаляє запис з кешу, якщо він існує."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def purge_expired(self) -> int:
+        """Видаляє всі прострочені записи та повертає їх кількість."""
+        now = time.monotonic()
+        expired_keys = [key for key, (_, expires_at) in self._data.items() if expires_at <= now]
+        for key in expired_keys:
+            del self._data[key]
+        self._expirations += len(expired_keys)
+        self._last_sweep = now
+        return len(expired_keys)
+
+    def entries(self) -> List[Tuple[K, V, float]]:
+        """Повертає актуальні записи разом із залишком TTL у секундах (для збереження знімка)."""
+        now = time.monotonic()
+        return [(key, value, expires_at - now) for key, (value, expires_at) in self._data.items() if expires_at > now]
+
+    def restore(self, key: K, value: V, ttl: float) -> None:
+        """Відновлює запис зі знімка із залишком TTL; прострочені записи ігноруються."""
+        if ttl > 0:
+            self.set(key, value, ttl=ttl)
+
+    def stats(self) -> Dict[str, int | float]:
+        """Повертає статистику використання кешу."""
+        lookups = self._hits + self._misses
+        return {
+            'size': len(self._data),
+            'max_size': self._max_size,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': self._hits / lookups if lookups else 0.0,
+            'evictions': self._evictions,
+            'expirations': self._expirations,
+        }
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """
+    Асинхронний кеш із завантаженням при промаху.
+    Одночасні промахи по одному ключу виконують завантажувач лише один раз (singleflight),
+    а TTL кожного запису отримує випадковий розкид, щоб уникнути лавини оновлень.
+
+    Якщо задано max_staleness, кеш працює за схемою stale-while-revalidate: застаріле значення
+    віддається одразу, а оновлення виконується у фоні. Поки бекенд недоступний, застаріле значення
+    продовжує віддаватися, але не довше ніж max_staleness секунд після закінчення TTL.
+    """
+    def __init__(
+        self,
+        name: str,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_size: int = 1024,
+        jitter: float = DEFAULT_TTL_JITTER,
+        max_staleness: float | None = None
+    ):
+        self.name = name
+        self._ttl = ttl
+        self._jitter = jitter
+        self._max_staleness = max_staleness or 0
+        # У сховищі запис живе ttl + max_staleness; момент, до якого він свіжий, зберігається поруч.
+        self._storage: TTLCache[K, Tuple[V, float]] = TTLCache(
+            max_size=max_size, default_ttl=ttl + self._max_staleness, name=name
+        )
+        self._inflight: Dict[K, asyncio.Future] = {}
+        self._refresh_not_before: Dict[K, float] = {}
+        self._loads = 0
+        self._load_errors = 0
+        self._coalesced = 0
+        self._stale_hits = 0
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]], ttl: float | None = None) -> V:
+        """
+        Повертає значення з кешу або завантажує його через loader.
+        Винятки завантажувача не кешуються і передаються всім очікувачам.
+        """
+        entry = self._storage.get(key, _MISSING)
+        if entry is not _MISSING:
+            value, fresh_until = entry
+            if fresh_until > time.monotonic():
+                return value
+
+            # Запис застарів, але ще в межах max_staleness: віддаємо його та оновлюємо у фоні.
+            self._stale_hits += 1
+            if self._refresh_not_before.get(key, 0) <= time.monotonic():
+                self._start_load(key, loader, ttl)
+            return value
+
+        future = self._start_load(key, loader, ttl)
+        return await asyncio.shield(future)
+
+    def _start_load(self, key: K, loader: Callable[[], Awaitable[V]], ttl: float | None) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is not None:
+            self._coalesced += 1
+            return future
+
+        future = asyncio.ensure_future(self._load(key, loader, ttl))
+        self._inflight[key] = future
+        future.add_done_callback(lambda f: self._release(key, f))
+        return future
+
+    async def _load(self, key: K, loader: Callable[[], Awaitable[V]], ttl: float | None) -> V:
+        self._loads += 1
+        try:
+            value = await loader()
+        except Exception as e:
+            self._load_errors += 1
+            if key in self._storage:
+                self._refresh_not_before[key] = time.monotonic() + STALE_REFRESH_RETRY_SECONDS
+                logger.warning("Failed to refresh cache '%s', serving stale value: %s", self.name, e)
+            raise
+        self._refresh_not_before.pop(key, None)
+        self.set(key, value, ttl)
+        return value
+
+    def _release(self, key: K, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
+
+    def _jittered(self, ttl: float | None) -> float:
+        base = self._ttl if ttl is None else ttl
+        return base * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        fresh_for = self._jittered(ttl)
+        self._storage.set(key, (value, time.monotonic() + fresh_for), ttl=fresh_for + self._max_staleness)
+
+    def invalidate(self, key: K) -> None:
+        self._storage.pop(key)
+        self._refresh_not_before.pop(key, None)
+
+    def entries(self) -> List[Tuple[K, V, float]]:
+        """
+        Повертає записи разом із залишком часу до застарівання в секундах.
+        Для застарілих записів (у межах max_staleness) залишок від'ємний.
+        """
+        now = time.monotonic()
+        return [(key, value, fresh_until - now) for key, (value, fresh_until), _ in self._storage.entries()]
+
+    def restore(self, key: K, value: V, ttl: float) -> None:
+        """
+        Відновлює запис зі знімка. Запис із від'ємним ttl стає застарілим і буде віддаватися,
+        доки не оновиться у фоні, якщо не вийшов за межі max_staleness.
+        """
+        if ttl + self._max_staleness > 0:
+            self._storage.set(key, (value, time.monotonic() + ttl), ttl=ttl + self._max_staleness)
+
+    def clear(self) -> None:
+        self._storage.clear()
+        self._refresh_not_before.clear()
+
+    def stats(self) -> Dict[str, int | float]:
+        """Повертає статистику кешу: влучання, промахи, витіснення та завантаження."""
+        return {
+            **self._storage.stats(),
+            'stale_hits': self._stale_hits,
+            'loads': self._loads,
+            'load_errors': self._load_errors,
+            'coalesced': self._coalesced,
+        }
@@ -0,0 +1,45 @@
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+MetricsSource = Callable[[], Dict[str, Any]]
+
+
+class MetricsReporter:
+    """
+    Періодично записує в лог метрики компонентів бота (влучання кешів тощо) — по одному рядку
+    JSON на джерело, щоб їх можна було відфільтрувати та зібрати системою збору логів.
+    """
+    def __init__(self, sources: Dict[str, MetricsSource] | None = None):
+        self._sources: Dict[str, MetricsSource] = dict(sources or {})
+
+    def add_source(self, name: str, source: MetricsSource) -> None:
+        self._sources[name] = source
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Повертає поточні метрики всіх джерел; помилка одного джерела не заважає іншим."""
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        for name, source in self._sources.items():
+            try:
+                snapshot[name] = source()
+            except Exception:
+                logger.exception("Failed to collect metrics from %s", name)
+        return snapshot
+
+    def log(self) -> None:
+        for name, metrics in self.collect().items():
+            logger.info("Metrics %s: %s", name, json.dumps(metrics, separators=(',', ':')))
+
+    async def run_periodically(self, interval_seconds: float) -> None:
+        """Періодично записує метрики в лог, доки задачу не буде скасовано."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            self.log()
+
+
+def collect_cache_stats(*providers: Any) -> Dict[str, MetricsSource]:
+    """Збирає джерела метрик кешів з усіх сервісів, що мають метод cache_stats()."""
+    return {type(provider).__name__: provider.cache_stats for provider in providers}
@@ -0,0 +1,189 @@
+from datetime import date, time
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from api import DailyScheduleDTO, LessonDTO, ScheduleOverrideInfoDTO, WeeklyScheduleDTO
+from application.cache import TTLCache
+
+MONTHS_UA = {
+    1: "Січня", 2: "Лютого", 3: "Березня", 4: "Квітня",
+    5: "Травня", 6: "Червня", 7: "Липня", 8: "Серпня",
+    9: "Вересня", 10: "Жовтня", 11: "Листопада", 12: "Грудня"
+}
+
+def get_seasonal_emoji(current_date: date) -> str:
+    """Повертає емодзі відповідно до пори року."""
+    month = current_date.month
+    if month in [12, 1, 2]:
+        return "❄️"  # Зима
+    elif month in [3, 4, 5]:
+        return "🌷"  # Весна
+    elif month in [6, 7, 8]:
+        return "☀️"  # Літо
+    else:  # 9, 10, 11
+        return "🍁"  # Осінь
+
+
+SEPARATOR = "═" * 20
+RENDERED_MESSAGE_CACHE_MAX_SIZE = 4096
+# DTO з кешу розкладу живуть не довше за його TTL, тож готовий текст можна тримати стільки ж.
+RENDERED_MESSAGE_TTL_SECONDS = 3600
+LESSON_FRAGMENT_CACHE_MAX_SIZE = 8192
+
+# Вміст пари, від якого залежить її рядок у повідомленні.
+LessonKey = Tuple[int, str | None, str | None, str | None, str, str, str, str]
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(iso_date: str) -> Tuple[date, str, str]:
+    """Повертає (дата, емодзі пори року, назва місяця в родовому відмінку) для ISO-рядка."""
+    parsed = date.fromisoformat(iso_date)
+    return parsed, get_seasonal_emoji(parsed), MONTHS_UA.get(parsed.month, "")
+
+
+class RenderedSchedule:
+    """Готовий текст розкладу разом з DTO, з якого його сформовано, та датою для клавіатури навігації."""
+    __slots__ = ('schedule', 'text', 'schedule_date')
+
+    def __init__(self, schedule: DailyScheduleDTO | WeeklyScheduleDTO, text: str, schedule_date: date):
+        self.schedule = schedule
+        self.text = text
+        # Дата дня або початку тижня, від якої будується навігація.
+        self.schedule_date = schedule_date
+
+
+class ScheduleRenderer:
+    """
+    Форматує розклад у повідомлення для Telegram.
+    - Час пар ("8:30-9:50") розбирається один раз для кожного слоту пари.
+    - Рядки пар кешуються за їхнім вмістом: той самий предмет повторюється щотижня і в кількох днях.
+    - Готові повідомлення кешуються за ідентичністю DTO: кеш розкладу повертає той самий об'єкт,
+      доки дані не оновляться, тож усі студенти групи отримують уже відформатований текст.
+      Запис тримає посилання на DTO, тому id() не може бути перевикористаний, поки запис існує.
+    """
+    def __init__(self):
+        self._pair_times: Dict[Tuple[str, str], str] = {}
+        self._lesson_lines: TTLCache[LessonKey, Tuple[str, str]] = TTLCache(
+            max_size=LESSON_FRAGMENT_CACHE_MAX_SIZE, default_ttl=RENDERED_MESSAGE_TTL_SECONDS, name="lesson_lines"
+        )
+        self._messages: TTLCache[Tuple[str, int], Tuple[object, str]] = TTLCache(
+            max_size=RENDERED_MESSAGE_CACHE_MAX_SIZE, default_ttl=RENDERED_MESSAGE_TTL_SECONDS, name="rendered_messages"
+        )
+
+    def render_daily(self, schedule: DailyScheduleDTO) -> str:
+        """Форматує розклад на день з урахуванням "вікон"."""
+        return self._memoized('daily', schedule, self._render_daily)
+
+    def render_weekly(self, schedule: WeeklyScheduleDTO) -> str:
+        """Форматує тижневий розклад з вікнами та описом замін."""
+        return self._memoized('weekly', schedule, self._render_weekly)
+
+    def _memoized(self, kind: str, schedule, render) -> str:
+        key = (kind, id(schedule))
+        cached = self._messages.get(key)
+        if cached is not None and cached[0] is schedule:
+            return cached[1]
+        text = render(schedule)
+        self._messages.set(key, (schedule, text))
+        return text
+
+    def _render_daily(self, schedule: DailyScheduleDTO) -> str:
+        schedule_date, seasonal_emoji, month_name = _parse_date(schedule.date)
+        week_type = "парний" if schedule.is_even_week else "непарний"
+
+        header1 = f"{seasonal_emoji} {schedule.day_of_week_name.capitalize()}, {schedule_date.day:02} {month_name}"
+        header2 = f"{schedule.group_name} · Тиждень {schedule.week_number} ({week_type})"
+        parts = [header1, header2]
+        self._append_override(parts, schedule.override_info)
+        parts.append(SEPARATOR)
+
+        if not schedule.lessons:
+            parts.append("🎉 Пар немає, можна відпочити!")
+        else:
+            self._append_lessons(parts, schedule.lessons, weekly=False)
+
+        return "\n".join(parts)
+
+    def _render_weekly(self, schedule: WeeklyScheduleDTO) -> str:
+        start_date, seasonal_emoji, _ = _parse_date(schedule.week_start_date)
+        end_date, _, _ = _parse_date(schedule.week_end_date)
+        week_type = "парний" if schedule.is_even_week else "непарний"
+
+        header1 = f"{seasonal_emoji} Розклад на тиждень ({start_date:%d.%m} - {end_date:%d.%m})"
+        header2 = f"{schedule.group_name} · Тиждень {schedule.week_number} ({week_type})"
+        parts = [header1, header2, SEPARATOR]
+
+        for daily_schedule in schedule.daily_schedules:
+            daily_date, _, month_name = _parse_date(daily_schedule.date)
+            parts.append(
+                f"\n<b><u>{daily_schedule.day_of_week_name.capitalize()}, "
+                f"{daily_date.day} {month_name}</u></b>"
+            )
+            self._append_override(parts, daily_schedule.override_info)
+
+            if not daily_schedule.lessons:
+                parts.append("  🎉 <i>Пар немає</i>")
+            else:
+                self._append_lessons(parts, daily_schedule.lessons, weekly=True)
+
+        return "\n".join(parts)
+
+    @staticmethod
+    def _append_override(parts: List[str], override_info: ScheduleOverrideInfoDTO | None) -> None:
+        if not override_info:
+            return
+        if override_info.substituted_day_name:
+            parts.append(f"❗️ <b>Заміна:</b> {override_info.substituted_day_name}")
+        if override_info.description:
+            parts.append(f"<i>{override_info.description}</i>")
+
+    def _append_lessons(self, parts: List[str], lessons: List[LessonDTO], weekly: bool) -> None:
+        """Додає рядки пар від першої до останньої, позначаючи пропущені номери як вікна."""
+        lessons_by_number = {lesson.pair_number: lesson for lesson in lessons}
+        indent = "  " if weekly else ""
+        for pair_num in range(1, max(lessons_by_number) + 1):
+            lesson = lessons_by_number.get(pair_num)
+            if lesson is None:
+                parts.append(f"{indent}{pair_num}. 😴 Вікно")
+            else:
+                parts.append(self._lesson_line(lesson)[1 if weekly else 0])
+
+    def _lesson_line(self, lesson: LessonDTO) -> Tuple[str, str]:
+        """Повертає рядок пари для денного та тижневого повідомлення."""
+        key = (
+            lesson.pair_number, lesson.subject_name, lesson.subject_short_name, lesson.lesson_url,
+            lesson.subject_type_abbreviation, lesson.teacher_full_name,
+            lesson.pair_start_time, lesson.pair_end_time
+        )
+        lines = self._lesson_lines.get(key)
+        if lines is not None:
+            return lines
+
+        lesson_name = lesson.subject_name or lesson.subject_short_name or "Невідомий предмет"
+        if lesson.lesson_url:
+            lesson_name = f"<a href='{lesson.lesson_url}'>{lesson_name}</a>"
+
+        line = (
+            f"{lesson.pair_number}. {lesson_name} "
+            f"({lesson.subject_type_abbreviation}) "
+            f"({self._pair_time(lesson.pair_start_time, lesson.pair_end_time)})"
+        )
+        lines = (f"{line}\n    └ <i>{lesson.teacher_full_name}</i>", f"  {line}")
+        self._lesson_lines.set(key, lines)
+        return lines
+
+    def _pair_time(self, start: str, end: str) -> str:
+        interval = self._pair_times.get((start, end))
+        if interval is None:
+            interval = (
+                f"{time.fromisoformat(start).strftime('%-H:%M')}-"
+                f"{time.fromisoformat(end).strftime('%-H:%M')}"
+            )
+            self._pair_times[(start, end)] = interval
+        return interval
+
+    def stats(self) -> Dict[str, Dict[str, int | float]]:
+        return {
+            'rendered_messages': self._messages.stats(),
+            'lesson_lines': self._lesson_lines.stats(),
+        }
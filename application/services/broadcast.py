@@ -1,18 +1,35 @@
 import asyncio
 import logging
+from typing import AsyncIterator, Tuple
+
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest
 
-from api.dto import PendingBroadcastDTO
+from api.dto import PendingBroadcastDTO, UserBroadcastTargetDTO
 from api.exceptions import ApiBadRequestError, ApiClientError, ResourceNotFoundError
 from api.gateways.broadcast_gateway import BroadcastGateway
+from api.streaming import JsonObjectStream
+from application.broadcasting import (BroadcastLease, BroadcastLeaseUnavailable, BroadcastSender, BroadcastStats,
+                                      BroadcastWorkerError, DeliveryJournal, ProgressCallback, RecipientHealthStore,
+                                      ShardedBroadcastRunner, report_progress, shard_of)
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 class BroadcastService:
-    def __init__(self, gateway: BroadcastGateway):
+    def __init__(
+        self,
+        gateway: BroadcastGateway,
+        recipient_health: RecipientHealthStore | None = None,
+        run_lease: BroadcastLease | None = None
+    ):
+        """
+        :param run_lease: Оренда, спільна для всіх реплік бота: з нею розсилку одночасно виконує лише одна репліка.
+        """
         self._gateway = gateway
+        self._recipient_health = recipient_health
+        self._run_lease = run_lease
+        # Розсилка, яку зараз виконує цей процес: її статистика та результат для тих, хто на неї чекає.
+        self._active_run: Tuple[BroadcastStats, asyncio.Future] | None = None
 
     async def create_broadcast(self, message_text: str, scheduled_at: str | None = None) -> str:
         """Створює завдання на розсилку через API та повертає повідомлення для адміна."""
@@ -35,54 +52,278 @@ class BroadcastService:
                 return "❌ Помилка авторизації: Невірний ключ доступу до API. Перевірте налаштування."
             return f"❌ Сталася непередбачена помилка API ({e.status_code}) при створенні розсилки."
 
-    async def send_pending_broadcast(self, bot: Bot) -> str:
+    async def _read_broadcast(self, stream: JsonObjectStream) -> PendingBroadcastDTO | None:
+        try:
+            fields = await stream.read_fields('id', 'messageText')
+        except ResourceNotFoundError:
+            return None
+        return PendingBroadcastDTO.model_validate(fields) if fields else None
+
+    async def _recipients(self, stream: JsonObjectStream, shard: Tuple[int, int] | None = None) -> AsyncIterator[int]:
+        async for item in stream.items():
+            telegram_id = UserBroadcastTargetDTO.model_validate(item).telegram_id
+            if shard is None or shard_of(telegram_id, shard[1]) == shard[0]:
+                yield telegram_id
+
+    async def run_pending_broadcast(self, bot: Bot, on_progress: ProgressCallback | None = None) -> BroadcastStats | None:
         """
-        Отримує одне завдання на розсилку з API, виконує його та повертає звіт.
+        Виконує одне завдання на розсилку: надсилає повідомлення та позначає його як виконане.
+        Отримувачі читаються з відповіді API потоково, тож відправка починається ще до завантаження
+        всього списку, а пам'ять не залежить від розміру аудиторії.
+        Якщо broadcast_worker_count > 1, відправка виконується окремими процесами, щоб не навантажувати
+        цикл подій, який обробляє запити користувачів.
+        Одночасно в процесі виконується лише одна розсилка (і з адмін-панелі, і з фонового диспетчера):
+        якщо вона вже триває, виклик чекає її завершення (передаючи її прогрес в on_progress) і повертає
+        її статистику, а якщо та розсилка не знайшла завдання — запускає власну.
+        Якщо передано on_progress, під час розсилки він періодично отримує поточну статистику.
+        Повертає None, якщо активних розсилок немає; піднімає BroadcastLeaseUnavailable,
+        якщо розсилку зараз виконує інша репліка.
         """
+        while self._active_run is not None:
+            stats = await self._follow_active_run(*self._active_run, on_progress)
+            if stats is not None:
+                return stats
+
+        stats = BroadcastStats()
+        finished: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._active_run = (stats, finished)
         try:
-            pending_data = await self._gateway.get_pending_broadcast(admin_api_key=settings.admin_api_key)
-            if not pending_data:
-                return "ℹ️ Немає активних розсилок для відправки."
-                
-            broadcast = PendingBroadcastDTO.model_validate(pending_data)
-            
-        except ResourceNotFoundError:
-            return "ℹ️ Немає активних розсилок для відправки."
+            result = await self._run_exclusive(bot, stats, on_progress)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                finished.set_exception(e)
+            else:
+                finished.set_exception(BroadcastWorkerError("Broadcast was interrupted before it finished"))
+            # Позначаємо виняток як отриманий, навіть якщо на розсилку ніхто не чекав.
+            finished.exception()
+            raise
+        else:
+            finished.set_result(result)
+            return result
+        finally:
+            self._active_run = None
+
+    @staticmethod
+    async def _follow_active_run(
+        stats: BroadcastStats,
+        finished: asyncio.Future,
+        on_progress: ProgressCallback | None
+    ) -> BroadcastStats | None:
+        """Чекає завершення розсилки, яку вже виконує цей процес, і передає її прогрес в on_progress."""
+        reporter = None
+        if on_progress is not None:
+            reporter = asyncio.create_task(
+                report_progress(stats, on_progress, settings.broadcast_progress_interval_seconds)
+            )
+        try:
+            return await asyncio.shield(finished)
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+
+    async def _run_exclusive(
+        self,
+        bot: Bot,
+        stats: BroadcastStats,
+        on_progress: ProgressCallback | None
+    ) -> BroadcastStats | None:
+        if self._run_lease is not None:
+            await self._run_lease.acquire()
+        try:
+            return await self._run_pending(bot, stats, on_progress)
+        finally:
+            if self._run_lease is not None:
+                await self._run_lease.release()
+
+    async def _run_pending(
+        self,
+        bot: Bot,
+        stats: BroadcastStats,
+        on_progress: ProgressCallback | None
+    ) -> BroadcastStats | None:
+        reporter = None
+        if on_progress is not None:
+            reporter = asyncio.create_task(
+                report_progress(stats, on_progress, settings.broadcast_progress_interval_seconds)
+            )
+        try:
+            if settings.broadcast_worker_count > 1:
+                broadcast_id = await self._run_in_workers(settings.broadcast_worker_count, stats)
+            else:
+                broadcast_id = await self._run_in_process(bot, stats)
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+        if broadcast_id is None:
+            return None
+
+        try:
+            await self._gateway.mark_broadcast_as_sent(
+                broadcast_id=broadcast_id,
+                admin_api_key=settings.admin_api_key
+            )
+            stats.marked_as_sent = True
+            logger.info("Broadcast #%d marked as sent.", broadcast_id)
         except ApiClientError as e:
-            return f"❌ Помилка отримання завдання на розсилку: {e.message}"
+            logger.error("CRITICAL: Failed to mark broadcast #%d as sent: %s", broadcast_id, e)
+            return stats
+
+        DeliveryJournal(settings.broadcast_journal_dir, broadcast_id).discard()
+        return stats
 
-        success_count = 0
-        failure_count = 0
+    async def _run_in_process(self, bot: Bot, stats: BroadcastStats) -> int | None:
+        """Виконує розсилку в цьому процесі; повертає її ID або None, якщо активних розсилок немає."""
+        async with self._gateway.stream_pending_broadcast(admin_api_key=settings.admin_api_key) as stream:
+            broadcast = await self._read_broadcast(stream)
+            if broadcast is None:
+                return None
+            stats.broadcast_id = broadcast.id
 
-        for user in broadcast.users:
+            logger.info("Starting broadcast #%d.", broadcast.id)
+            journal = DeliveryJournal(settings.broadcast_journal_dir, broadcast.id).open()
+            sender = BroadcastSender(
+                bot,
+                rate_per_second=settings.broadcast_rate_per_second,
+                concurrency=settings.broadcast_concurrency
+            )
             try:
-                await bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=broadcast.message_text,
-                    parse_mode="HTML"
+                await sender.send(
+                    broadcast.message_text,
+                    self._recipients(stream),
+                    journal=journal,
+                    stats=stats,
+                    health=self._recipient_health
                 )
-                success_count += 1
-            except TelegramBadRequest as e:
-                logger.warning("Failed to send broadcast to user %d: %s", user.telegram_id, e)
-                failure_count += 1
-            except Exception:
-                logger.exception("Unexpected error sending to user %d", user.telegram_id)
-                failure_count += 1
-            
-            await asyncio.sleep(0.1)
+            finally:
+                journal.close()
+        return broadcast.id
 
+    async def _run_in_workers(self, worker_count: int, stats: BroadcastStats) -> int | None:
+        """Виконує розсилку в процесах-виконавцях; повертає її ID або None, якщо активних розсилок немає."""
+        async with self._gateway.stream_pending_broadcast(admin_api_key=settings.admin_api_key) as stream:
+            broadcast = await self._read_broadcast(stream)
+        if broadcast is None:
+            return None
+
+        logger.info("Starting broadcast #%d in %d worker processes.", broadcast.id, worker_count)
+        stats.broadcast_id = broadcast.id
         try:
-            await self._gateway.mark_broadcast_as_sent(
-                broadcast_id=broadcast.id,
-                admin_api_key=settings.admin_api_key
+            await ShardedBroadcastRunner(worker_count).run(broadcast.id, stats=stats)
+        finally:
+            # Виконавці дописують нових недоступних отримувачів у спільний файл.
+            if self._recipient_health is not None:
+                self._recipient_health.load()
+        return broadcast.id
+
+    async def run_broadcast_shard(
+        self,
+        bot: Bot,
+        broadcast_id: int,
+        shard: int,
+        shard_count: int,
+        stats: BroadcastStats
+    ) -> bool:
+        """
+        Надсилає розсилку одному шарду отримувачів (викликається з процесу broadcast_worker.py).
+        Швидкість і паралельність діляться між шардами порівну. Повертає False, якщо активна розсилка
+        вже не та, для якої запущено виконавця.
+        """
+        async with self._gateway.stream_pending_broadcast(admin_api_key=settings.admin_api_key) as stream:
+            broadcast = await self._read_broadcast(stream)
+            if broadcast is None or broadcast.id != broadcast_id:
+                logger.error("Pending broadcast is no longer #%d, shard %d is not sent.", broadcast_id, shard)
+                return False
+
+            journal = DeliveryJournal(settings.broadcast_journal_dir, broadcast_id, shard=(shard, shard_count)).open()
+            sender = BroadcastSender(
+                bot,
+                rate_per_second=settings.broadcast_rate_per_second / shard_count,
+                concurrency=max(1, settings.broadcast_concurrency // shard_count)
             )
-            logger.info("Broadcast #%d marked as sent.", broadcast.id)
+            try:
+                await sender.send(
+                    broadcast.message_text,
+                    self._recipients(stream, shard=(shard, shard_count)),
+                    journal=journal,
+                    stats=stats,
+                    health=self._recipient_health
+                )
+            finally:
+                journal.close()
+        return True
+
+    def mark_recipient_reachable(self, telegram_id: int) -> None:
+        """Повертає користувача до розсилок, якщо раніше його було позначено як недоступного."""
+        if self._recipient_health is not None:
+            self._recipient_health.mark_reachable(telegram_id)
+
+    def export_unreachable_recipients(self) -> Tuple[int, str] | None:
+        """
+        Повертає кількість недоступних отримувачів і їх список у форматі CSV
+        або None, якщо облік недоступних отримувачів вимкнено.
+        """
+        if self._recipient_health is None:
+            return None
+        return len(self._recipient_health), self._recipient_health.export_csv()
+
+    def format_progress(self, stats: BroadcastStats) -> str:
+        """Форматує поточний прогрес розсилки для повідомлення адміну."""
+        done = stats.processed + stats.skipped
+        progress = f"{done} з {stats.total}" if stats.total is not None else f"{done} (список отримувачів ще завантажується)"
+        lines = [
+            "📤 Розсилка триває...\n",
+            f"📊 Оброблено: {progress}",
+            f"🟢 Надіслано успішно: {stats.sent}",
+            f"🔴 Не вдалося надіслати: {stats.failed}",
+            f"🚫 Заблокували бота: {stats.blocked}",
+            f"⏭ Пропущено (вже надіслано раніше): {stats.skipped}",
+            f"🚷 Пропущено недоступних: {stats.unreachable}",
+            f"⚡ Швидкість: {stats.throughput:.1f} повідомлень/с",
+        ]
+        if stats.rate_limited:
+            paused = f", пауза ще {stats.paused_for:.1f} с" if stats.paused_for else ""
+            lines.append(f"⏳ Обмеження Telegram: {stats.rate_limited}{paused}")
+        if stats.eta is not None:
+            minutes, seconds = divmod(int(stats.eta), 60)
+            lines.append(f"🕒 Залишилось приблизно: {minutes} хв {seconds} с")
+        return "\n".join(lines)
+
+    async def send_pending_broadcast(self, bot: Bot, on_progress: ProgressCallback | None = None) -> str:
+        """
+        Отримує одне завдання на розсилку з API, виконує його та повертає звіт.
+        """
+        try:
+            stats = await self.run_pending_broadcast(bot, on_progress=on_progress)
         except ApiClientError as e:
-            logger.error("CRITICAL: Failed to mark broadcast #%d as sent: %s", broadcast.id, e)
-            return "🔴 КРИТИЧНА ПОМИЛКА: розсилку було надіслано, але не вдалося позначити її як виконану. Можливі повторні відправки!"
+            return f"❌ Помилка отримання завдання на розсилку: {e.message}"
+        except BroadcastLeaseUnavailable as e:
+            logger.info("Broadcast not started: %s", e)
+            return (
+                "⏳ Розсилку зараз виконує інша репліка бота (або Redis недоступний). "
+                "Завдання залишилося в черзі й буде надіслане пізніше."
+            )
+        except BroadcastWorkerError as e:
+            logger.error("Broadcast interrupted: %s", e)
+            return (
+                "❌ Розсилку перервано до завершення (зупинка бота або помилка процесу-виконавця). "
+                "Журнали доставки збережено, повторний запуск продовжить розсилку."
+            )
+
+        if stats is None:
+            return "ℹ️ Немає активних розсилок для відправки."
+
+        if not stats.marked_as_sent:
+            return (
+                "🔴 КРИТИЧНА ПОМИЛКА: розсилку було надіслано, але не вдалося позначити її як виконану. "
+                "Журнал доставки збережено, тож повторний запуск не надішле повідомлення тим, хто його вже отримав."
+            )
 
         return (
             f"✅ Розсилку завершено!\n\n"
-            f"🟢 Надіслано успішно: {success_count}\n"
-            f"🔴 Не вдалося надіслати: {failure_count}"
+            f"🟢 Надіслано успішно: {stats.sent}\n"
+            f"🔴 Не вдалося надіслати: {stats.failed}\n"
+            f"🚫 Заблокували бота: {stats.blocked}\n"
+            f"⏭ Пропущено (вже надіслано раніше): {stats.skipped}\n"
+            f"🚷 Пропущено недоступних: {stats.unreachable}\n"
+            f"⏱ Тривалість: {stats.elapsed:.0f} с ({stats.throughput:.1f} повідомлень/с)"
         )
\ No newline at end of file
@@ -1,30 +1,37 @@
-import time
-from typing import List, Tuple
+from typing import Dict, List
 from api import ApiGroupDTO
 from api.gateways import GroupGateway
-
-CACHE_TTL_SECONDS = 3600  # 1 година
+from application.cache import AsyncTTLCache
+from application.snapshot import SnapshotSection
+from config import settings
 
 class GroupService:
     def __init__(self, gateway: GroupGateway):
         self._gateway = gateway
-        self._groups_cache: Tuple[List[ApiGroupDTO], float] | None = None
+        self._groups_cache: AsyncTTLCache[str, List[ApiGroupDTO]] = AsyncTTLCache(
+            name="groups",
+            ttl=settings.reference_cache_ttl_seconds,
+            max_size=1,
+            max_staleness=settings.reference_cache_max_staleness_seconds
+        )
 
     async def get_all_groups(self) -> List[ApiGroupDTO]:
         """Отримує всі групи з API, використовуючи кеш з TTL."""
-        if self._groups_cache is not None:
-            data, timestamp = self._groups_cache
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return data
+        return await self._groups_cache.get_or_load('all', self._load_groups)
 
+    async def _load_groups(self) -> List[ApiGroupDTO]:
         response_data = await self._gateway.get_all_groups()
         if not response_data:
-            self._groups_cache = ([], time.time()) # Кешуємо пустий результат
-            return []
+            return [] # Кешуємо пустий результат
         
-        groups = [ApiGroupDTO.model_validate(group) for group in response_data]
-        self._groups_cache = (groups, time.time())
-        return groups
+        return [ApiGroupDTO.model_validate(group) for group in response_data]
+
+    def cache_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """Повертає метрики кешу груп."""
+        return {'groups': self._groups_cache.stats()}
+
+    def snapshot_sections(self) -> Dict[str, SnapshotSection]:
+        return {'groups': SnapshotSection(self._groups_cache, str, List[ApiGroupDTO])}
 
     async def format_groups_list(self) -> str:
         """
@@ -36,4 +43,4 @@ class GroupService:
 
         header = "<b>Список доступних груп:</b>\n\n"
         body = "\n".join(f"• <code>{group.name}</code> (ID: <code>{group.id}</code>)" for group in groups)
-        return header + body
\ No newline at end of file
+        return header + body
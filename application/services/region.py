@@ -1,34 +1,32 @@
-import time
-from typing import List, Dict, Tuple
+from typing import List, Dict
 from api import ApiRegionDTO
 from api.gateways import RegionGateway
-
-CACHE_TTL_SECONDS = 3600  # 1 година
+from application.cache import AsyncTTLCache
+from application.snapshot import SnapshotSection
+from config import settings
 
 class RegionService:
     def __init__(self, gateway: RegionGateway):
         self._gateway = gateway
-        self._regions_cache: Tuple[List[ApiRegionDTO], float] | None = None
+        self._regions_cache: AsyncTTLCache[str, List[ApiRegionDTO]] = AsyncTTLCache(
+            name="regions",
+            ttl=settings.reference_cache_ttl_seconds,
+            max_size=1,
+            max_staleness=settings.reference_cache_max_staleness_seconds
+        )
         self._region_map_cache: Dict[int, str] | None = None
+        self._region_map_source: List[ApiRegionDTO] | None = None
 
     async def get_all_regions(self) -> List[ApiRegionDTO]:
         """Отримує всі регіони, використовуючи кеш з TTL."""
-        if self._regions_cache is not None:
-            data, timestamp = self._regions_cache
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return data
+        return await self._regions_cache.get_or_load('all', self._load_regions)
 
+    async def _load_regions(self) -> List[ApiRegionDTO]:
         response_data = await self._gateway.get_all_regions()
         if not response_data:
-            self._regions_cache = ([], time.time())
-            self._region_map_cache = {}
             return []
         
-        regions_dtos = [ApiRegionDTO.model_validate(region) for region in response_data]
-        
-        self._regions_cache = (regions_dtos, time.time())
-        self._region_map_cache = None
-        return regions_dtos
+        return [ApiRegionDTO.model_validate(region) for region in response_data]
 
     async def get_timezone_by_id(self, region_id: int) -> str | None:
         """
@@ -36,10 +34,19 @@ class RegionService:
         """
         regions = await self.get_all_regions()
         
-        if self._region_map_cache is None and regions:
+        # Мапа перебудовується лише тоді, коли кеш повернув новий список регіонів.
+        if self._region_map_source is not regions:
             self._region_map_cache = {region.id: region.time_zone_id for region in regions}
+            self._region_map_source = regions
         
         if self._region_map_cache:
             return self._region_map_cache.get(region_id)
         
-        return None
\ No newline at end of file
+        return None
+
+    def cache_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """Повертає метрики кешу регіонів."""
+        return {'regions': self._regions_cache.stats()}
+
+    def snapshot_sections(self) -> Dict[str, SnapshotSection]:
+        return {'regions': SnapshotSection(self._regions_cache, str, List[ApiRegionDTO])}
@@ -1,28 +1,62 @@
-from datetime import date, time
-from api import DailyScheduleDTO, WeeklyScheduleDTO
+import asyncio
+import logging
+from time import monotonic
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import ValidationError
+from api import DailyScheduleDTO, WeeklyScheduleDTO, ApiClientError, ResourceNotFoundError
 
 from api.gateways import ScheduleGateway
+from application.cache import TTLCache
+from application.rendering import RenderedSchedule, ScheduleRenderer
+from application.shared_cache import SharedCacheBackend
+from application.snapshot import SnapshotSection
 
 from .user import UserService
 from .region import RegionService
 
-MONTHS_UA = {
-    1: "Січня", 2: "Лютого", 3: "Березня", 4: "Квітня",
-    5: "Травня", 6: "Червня", 7: "Липня", 8: "Серпня",
-    9: "Вересня", 10: "Жовтня", 11: "Листопада", 12: "Грудня"
-}
-
-def get_seasonal_emoji(current_date: date) -> str:
-    """Повертає емодзі відповідно до пори року."""
-    month = current_date.month
-    if month in [12, 1, 2]:
-        return "❄️"  # Зима
-    elif month in [3, 4, 5]:
-        return "🌷"  # Весна
-    elif month in [6, 7, 8]:
-        return "☀️"  # Літо
-    else:  # 9, 10, 11
-        return "🍁"  # Осінь
+logger = logging.getLogger(__name__)
+
+# Розклад за минулі дати вже не змінюється, тож його можна тримати в кеші практично безстроково.
+PAST_SCHEDULE_TTL_SECONDS = 7 * 24 * 3600
+TODAY_SCHEDULE_TTL_SECONDS = 300  # 5 хвилин
+FUTURE_SCHEDULE_TTL_SECONDS = 1800  # 30 хвилин
+SCHEDULE_CACHE_MAX_SIZE = 4096
+# Глобальний бюджет фонових запитів попереднього завантаження сусідніх днів/тижнів.
+PREFETCH_CONCURRENCY = 4
+# Пауза у попередньому завантаженні після помилки API, щоб не навантажувати бекенд.
+PREFETCH_BACKOFF_SECONDS = 30
+
+ScheduleCacheKey = Tuple[int, str, date | None]
+# (group_id, time_zone_id, date, "daily" | "weekly")
+RenderedScheduleKey = Tuple[int, str, date | None, str]
+
+
+def get_today_in_zone(time_zone_id: str) -> date | None:
+    """Повертає поточну дату в часовому поясі або None, якщо пояс невідомий."""
+    try:
+        return datetime.now(ZoneInfo(time_zone_id)).date()
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def get_schedule_ttl(time_zone_id: str, first_day: date, last_day: date | None = None) -> float:
+    """
+    Визначає TTL для розкладу на період: минуле кешується надовго, сьогодні — недовго.
+    "Сьогодні" визначається в часовому поясі розкладу, а не сервера.
+    """
+    today = get_today_in_zone(time_zone_id) or date.today()
+    if (last_day or first_day) < today:
+        return PAST_SCHEDULE_TTL_SECONDS
+    if first_day > today:
+        return FUTURE_SCHEDULE_TTL_SECONDS
+    return TODAY_SCHEDULE_TTL_SECONDS
+
+
+def _shared_key(kind: str, group_id: int, time_zone_id: str, schedule_date: date) -> str:
+    return f"schedule:{kind}:{group_id}:{time_zone_id}:{schedule_date.isoformat()}"
 
 
 class ScheduleService:
@@ -30,157 +64,404 @@ class ScheduleService:
         self,
         schedule_gateway: ScheduleGateway,
         user_service: UserService,
-        region_service: RegionService
+        region_service: RegionService,
+        shared_cache: SharedCacheBackend | None = None
     ):
+        """
+        :param shared_cache: Необов'язковий кеш другого рівня, спільний для всіх реплік бота.
+        """
         self._schedule_gateway = schedule_gateway
         self._user_service = user_service
         self._region_service = region_service
+        self._shared_cache = shared_cache
+        # Розклад залежить лише від (group_id, time_zone_id, date), тому кеш спільний для всіх студентів групи.
+        self._daily_cache: TTLCache[ScheduleCacheKey, DailyScheduleDTO] = TTLCache(
+            max_size=SCHEDULE_CACHE_MAX_SIZE, default_ttl=TODAY_SCHEDULE_TTL_SECONDS, name="daily_schedule"
+        )
+        self._weekly_cache: TTLCache[ScheduleCacheKey, WeeklyScheduleDTO] = TTLCache(
+            max_size=SCHEDULE_CACHE_MAX_SIZE, default_ttl=TODAY_SCHEDULE_TTL_SECONDS, name="weekly_schedule"
+        )
+        self._prefetch_semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+        self._prefetch_paused_until = 0.0
+        self._renderer = ScheduleRenderer()
+        # Текст розкладу однаковий для всіх студентів групи; відрізняється лише клавіатура.
+        self._rendered_cache: TTLCache[RenderedScheduleKey, RenderedSchedule] = TTLCache(
+            max_size=SCHEDULE_CACHE_MAX_SIZE, default_ttl=TODAY_SCHEDULE_TTL_SECONDS, name="rendered_schedule"
+        )
 
-    async def get_schedule_for_day(self, telegram_id: int, schedule_date: date | None = None) -> DailyScheduleDTO:
+    async def _get_user_group_and_timezone(self, telegram_id: int) -> Tuple[int, str]:
+        """Повертає (group_id, time_zone_id) користувача."""
         user = await self._user_service.get_user_by_telegram_id(telegram_id)
         if not user:
-            raise ValueError("Користувача не знайдено...")
-        
-        regions = await self._region_service.get_all_regions()
-        user_region = next((r for r in regions if r.id == user.region_id), None)
-        
-        if not user_region:
-            raise ValueError(f"Не вдалося знайти регіон з ID={user.region_id}...")
+            raise ValueError("Користувача не знайдено. Будь ласка, зареєструйтесь: /start")
 
-        # НЕ делаем лишний вызов, а просто берем time_zone_id из уже полученного объекта
-        time_zone_id = user_region.time_zone_id
+        time_zone_id = await self._region_service.get_timezone_by_id(user.region_id)
+        if not time_zone_id:
+            raise ValueError(f"Не вдалося знайти часовий пояс для регіону з ID={user.region_id}.")
+
+        return user.group_id, time_zone_id
+
+    async def get_group_schedule_for_day(
+        self,
+        group_id: int,
+        time_zone_id: str,
+        schedule_date: date | None = None
+    ) -> DailyScheduleDTO:
+        """
+        Отримує розклад групи на день, використовуючи спільний кеш.
+        День береться з тижневого розкладу, тож перегляд усього тижня коштує один запит до API.
+        """
+        if schedule_date is None:
+            schedule_date = get_today_in_zone(time_zone_id)
 
+        cache_key = (group_id, time_zone_id, schedule_date)
+        cached = self._daily_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if schedule_date is not None:
+            # Тиждень з цією датою вже може бути в кеші, навіть якщо самого дня в ньому немає (наприклад, вихідних):
+            # тоді повторно завантажувати тиждень немає сенсу.
+            week = self._weekly_cache.get(cache_key)
+            if week is None and await self._load_shared(group_id, time_zone_id, schedule_date):
+                cached = self._daily_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                week = self._weekly_cache.get(cache_key)
+            if week is None:
+                try:
+                    week = await self._fetch_week(group_id, time_zone_id, schedule_date)
+                except ResourceNotFoundError:
+                    pass
+            if week is not None:
+                cached = self._day_from_week(group_id, time_zone_id, schedule_date, week)
+                if cached is not None:
+                    return cached
+
+        # Дня немає в тижневому розкладі (або дата невідома) — звертаємося до денного endpoint.
         date_str = schedule_date.isoformat() if schedule_date else None
-        
         schedule_data = await self._schedule_gateway.get_daily_schedule_for_group(
-            group_id=user.group_id,
-            time_zone_id=time_zone_id, # Используем полученное значение
+            group_id=group_id,
+            time_zone_id=time_zone_id,
             date=date_str
         )
-    
-        return DailyScheduleDTO.model_validate(schedule_data)
-    
-    async def get_schedule_for_week(self, telegram_id: int, schedule_date: date | None = None) -> WeeklyScheduleDTO:
-        """Отримує розклад на тиждень для користувача."""
-        user = await self._user_service.get_user_by_telegram_id(telegram_id)
-        if not user:
-            raise ValueError("Користувача не знайдено. Будь ласка, зареєструйтесь: /start")
-        
-        time_zone_id = await self._region_service.get_timezone_by_id(user.region_id)
-        if not time_zone_id:
-            raise ValueError(f"Не вдалося знайти часовий пояс для регіону з ID={user.region_id}.")
+        schedule = DailyScheduleDTO.model_validate(schedule_data)
+
+        actual_date = date.fromisoformat(schedule.date)
+        self._daily_cache.set(
+            (group_id, time_zone_id, actual_date), schedule, ttl=get_schedule_ttl(time_zone_id, actual_date)
+        )
+        if self._shared_cache is not None:
+            await self._shared_cache.set(
+                _shared_key('daily', group_id, time_zone_id, actual_date),
+                schedule.model_dump_json(by_alias=True).encode(),
+                ttl=get_schedule_ttl(time_zone_id, actual_date)
+            )
+        if schedule_date is None:
+            # "Сьогодні" залежить від часового поясу, тому запит без дати кешуємо ненадовго.
+            self._daily_cache.set(cache_key, schedule, ttl=TODAY_SCHEDULE_TTL_SECONDS)
+        return schedule
+
+    async def get_group_schedule_for_week(
+        self,
+        group_id: int,
+        time_zone_id: str,
+        schedule_date: date | None = None
+    ) -> WeeklyScheduleDTO:
+        """Отримує розклад групи на тиждень, використовуючи спільний кеш."""
+        if schedule_date is None:
+            schedule_date = get_today_in_zone(time_zone_id)
+
+        cache_key = (group_id, time_zone_id, schedule_date)
+        cached = self._weekly_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if schedule_date is not None and await self._load_shared(group_id, time_zone_id, schedule_date):
+            cached = self._weekly_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        return await self._fetch_week(group_id, time_zone_id, schedule_date)
+
+    def _day_from_week(
+        self,
+        group_id: int,
+        time_zone_id: str,
+        schedule_date: date,
+        week: WeeklyScheduleDTO
+    ) -> DailyScheduleDTO | None:
+        """Бере день з тижневого розкладу і кешує його; None, якщо цього дня в тижні немає."""
+        date_str = schedule_date.isoformat()
+        for daily_schedule in week.daily_schedules:
+            if daily_schedule.date == date_str:
+                self._daily_cache.set(
+                    (group_id, time_zone_id, schedule_date),
+                    daily_schedule,
+                    ttl=get_schedule_ttl(time_zone_id, schedule_date)
+                )
+                return daily_schedule
+        return None
 
+    async def _fetch_week(self, group_id: int, time_zone_id: str, schedule_date: date | None) -> WeeklyScheduleDTO:
         date_str = schedule_date.isoformat() if schedule_date else None
-        
         schedule_data = await self._schedule_gateway.get_weekly_schedule_for_group(
-            group_id=user.group_id,
+            group_id=group_id,
             time_zone_id=time_zone_id,
             date=date_str
         )
-        
-        return WeeklyScheduleDTO.model_validate(schedule_data)
-
-    def format_schedule_message(self, schedule: DailyScheduleDTO) -> str:
-        """Форматує об'єкт розкладу у повідомлення для користувача з урахуванням "вікон"."""
-        schedule_date = date.fromisoformat(schedule.date)
-        
-        seasonal_emoji = get_seasonal_emoji(schedule_date)
-        day = schedule_date.day
-        month_name = MONTHS_UA.get(schedule_date.month, "")
-        week_type = "парний" if schedule.is_even_week else "непарний"
-        
-        header1 = f"{seasonal_emoji} {schedule.day_of_week_name.capitalize()}, {day:02} {month_name}"
-        header2 = f"{schedule.group_name} · Тиждень {schedule.week_number} ({week_type})"
-        parts = [header1, header2]
-        
-        if schedule.override_info:
-            if schedule.override_info.substituted_day_name:
-                parts.append(f"❗️ <b>Заміна:</b> {schedule.override_info.substituted_day_name}")
-            if schedule.override_info.description:
-                parts.append(f"<i>{schedule.override_info.description}</i>")
-
-        parts.append("═" * 20)
-
-        if not schedule.lessons:
-            parts.append("🎉 Пар немає, можна відпочити!")
-        else:
-            lessons_by_number = {lesson.pair_number: lesson for lesson in schedule.lessons}
-            max_pair = max(lessons_by_number.keys()) if lessons_by_number else 0
-
-            for pair_num in range(1, max_pair + 1):
-                lesson = lessons_by_number.get(pair_num)
-                
-                if lesson:
-                    start_time = time.fromisoformat(lesson.pair_start_time).strftime('%-H:%M')
-                    end_time = time.fromisoformat(lesson.pair_end_time).strftime('%-H:%M')
-                    lesson_name = lesson.subject_name or lesson.subject_short_name or "Невідомий предмет"
-    
-                    if lesson.lesson_url:
-                        lesson_name = f"<a href='{lesson.lesson_url}'>{lesson_name}</a>"
-
-                    lesson_line = (
-                        f"{lesson.pair_number}. {lesson_name} "
-                        f"({lesson.subject_type_abbreviation}) "
-                        f"({start_time}-{end_time})\n"
-                        f"    └ <i>{lesson.teacher_full_name}</i>"
-                    )
-                    parts.append(lesson_line)
-                else:
-                    parts.append(f"{pair_num}. 😴 Вікно")
-
-        return "\n".join(parts)
-    
-    def format_weekly_schedule_message(self, schedule: WeeklyScheduleDTO) -> str:
-        """Форматує об'єкт тижневого розкладу у велике повідомлення з вікнами та описом замін."""
-        start_date = date.fromisoformat(schedule.week_start_date)
-        end_date = date.fromisoformat(schedule.week_end_date)
-        
-        seasonal_emoji = get_seasonal_emoji(start_date)
-        week_type = "парний" if schedule.is_even_week else "непарний"
-        
-        header1 = f"{seasonal_emoji} Розклад на тиждень ({start_date:%d.%m} - {end_date:%d.%m})"
-        header2 = f"{schedule.group_name} · Тиждень {schedule.week_number} ({week_type})"
-        
-        parts = [header1, header2, "═" * 20]
-        
+        schedule = WeeklyScheduleDTO.model_validate(schedule_data)
+        self._store_week(group_id, time_zone_id, schedule)
+        await self._share_week(group_id, time_zone_id, schedule)
+
+        if schedule_date is None:
+            self._weekly_cache.set((group_id, time_zone_id, schedule_date), schedule, ttl=TODAY_SCHEDULE_TTL_SECONDS)
+        return schedule
+
+    async def _load_shared(self, group_id: int, time_zone_id: str, schedule_date: date) -> bool:
+        """
+        Шукає розклад на дату в спільному кеші (тиждень і день — одним запитом) і переносить знайдене
+        в локальний кеш. Повертає True, якщо щось знайдено.
+        """
+        if self._shared_cache is None:
+            return False
+
+        raw_week, raw_day = await self._shared_cache.get_many([
+            _shared_key('weekly', group_id, time_zone_id, schedule_date),
+            _shared_key('daily', group_id, time_zone_id, schedule_date),
+        ])
+        try:
+            if raw_week is not None:
+                self._store_week(group_id, time_zone_id, WeeklyScheduleDTO.model_validate_json(raw_week))
+                return True
+            if raw_day is not None:
+                self._daily_cache.set(
+                    (group_id, time_zone_id, schedule_date),
+                    DailyScheduleDTO.model_validate_json(raw_day),
+                    ttl=get_schedule_ttl(time_zone_id, schedule_date)
+                )
+                return True
+        except ValidationError as e:
+            logger.warning("Ignoring invalid shared cache entry for group %d: %s", group_id, e)
+        return False
+
+    async def _share_week(self, group_id: int, time_zone_id: str, schedule: WeeklyScheduleDTO) -> None:
+        """Зберігає тижневий розклад у спільному кеші під кожною датою тижня."""
+        if self._shared_cache is None:
+            return
+
+        week_start = date.fromisoformat(schedule.week_start_date)
+        week_end = date.fromisoformat(schedule.week_end_date)
+        payload = schedule.model_dump_json(by_alias=True).encode()
+        items = {}
+        day = week_start
+        while day <= week_end:
+            items[_shared_key('weekly', group_id, time_zone_id, day)] = payload
+            day += timedelta(days=1)
+        await self._shared_cache.set_many(items, ttl=get_schedule_ttl(time_zone_id, week_start, week_end))
+
+    def _store_week(
+        self,
+        group_id: int,
+        time_zone_id: str,
+        schedule: WeeklyScheduleDTO,
+        ttl: float | None = None
+    ) -> None:
+        """
+        Кешує тижневий розклад під кожною датою тижня та розкладає його на денні записи,
+        щоб навігація по днях обслуговувалась з кешу.
+        :param ttl: Спільний TTL тижня та його днів (залишок TTL під час відновлення зі знімка);
+            без нього TTL визначається за датами.
+        """
+        week_start = date.fromisoformat(schedule.week_start_date)
+        week_end = date.fromisoformat(schedule.week_end_date)
+        week_ttl = ttl if ttl is not None else get_schedule_ttl(time_zone_id, week_start, week_end)
+
+        day = week_start
+        while day <= week_end:
+            self._weekly_cache.set((group_id, time_zone_id, day), schedule, ttl=week_ttl)
+            day += timedelta(days=1)
+
         for daily_schedule in schedule.daily_schedules:
             daily_date = date.fromisoformat(daily_schedule.date)
-            day_header = (
-                f"<b><u>{daily_schedule.day_of_week_name.capitalize()}, "
-                f"{daily_date.day} {MONTHS_UA.get(daily_date.month, '')}</u></b>"
+            self._daily_cache.set(
+                (group_id, time_zone_id, daily_date),
+                daily_schedule,
+                ttl=ttl if ttl is not None else get_schedule_ttl(time_zone_id, daily_date)
             )
-            parts.append(f"\n{day_header}")
-
-            if daily_schedule.override_info:
-                if daily_schedule.override_info.substituted_day_name:
-                    parts.append(f"❗️ <b>Заміна:</b> {daily_schedule.override_info.substituted_day_name}")
-                if daily_schedule.override_info.description:
-                    parts.append(f"<i>{daily_schedule.override_info.description}</i>")
-    
-            if not daily_schedule.lessons:
-                parts.append("  🎉 <i>Пар немає</i>")
-            else:
-                lessons_by_number = {lesson.pair_number: lesson for lesson in daily_schedule.lessons}
-                max_pair_for_day = max(lessons_by_number.keys()) if lessons_by_number else 0
-
-                for pair_num in range(1, max_pair_for_day + 1):
-                    lesson = lessons_by_number.get(pair_num)
-                    
-                    if lesson:
-                        start_time = time.fromisoformat(lesson.pair_start_time).strftime('%-H:%M')
-                        end_time = time.fromisoformat(lesson.pair_end_time).strftime('%-H:%M')
-                        
-                        lesson_name = lesson.subject_name or lesson.subject_short_name or "Невідомий предмет"
-                        if lesson.lesson_url:
-                            lesson_name = f"<a href='{lesson.lesson_url}'>{lesson_name}</a>"
-
-                        lesson_line = (
-                            f"  {lesson.pair_number}. {lesson_name} "
-                            f"({lesson.subject_type_abbreviation}) "
-                            f"({start_time}-{end_time})"
-                        )
-                        parts.append(lesson_line)
+
+    async def get_rendered_schedule_for_day(
+        self,
+        telegram_id: int,
+        schedule_date: date | None = None
+    ) -> RenderedSchedule:
+        """Повертає відформатований розклад користувача на день."""
+        group_id, time_zone_id = await self._get_user_group_and_timezone(telegram_id)
+        if schedule_date is None:
+            schedule_date = get_today_in_zone(time_zone_id)
+
+        rendered = self._cached_rendered('daily', group_id, time_zone_id, schedule_date)
+        if rendered is None:
+            schedule = await self.get_group_schedule_for_day(group_id, time_zone_id, schedule_date)
+            rendered = self._render(group_id, time_zone_id, schedule_date, schedule)
+        return rendered
+
+    async def get_rendered_schedule_for_week(
+        self,
+        telegram_id: int,
+        schedule_date: date | None = None
+    ) -> RenderedSchedule:
+        """Повертає відформатований розклад користувача на тиждень, що містить дату."""
+        group_id, time_zone_id = await self._get_user_group_and_timezone(telegram_id)
+        if schedule_date is None:
+            schedule_date = get_today_in_zone(time_zone_id)
+
+        rendered = self._cached_rendered('weekly', group_id, time_zone_id, schedule_date)
+        if rendered is None:
+            schedule = await self.get_group_schedule_for_week(group_id, time_zone_id, schedule_date)
+            rendered = self._render(group_id, time_zone_id, schedule_date, schedule)
+        return rendered
+
+    async def peek_rendered_schedule_for_day(self, telegram_id: int) -> RenderedSchedule | None:
+        """Повертає розклад користувача на сьогодні лише з кешу (можливо, застарілий), без запиту до API."""
+        group_id, time_zone_id = await self._get_user_group_and_timezone(telegram_id)
+        today = get_today_in_zone(time_zone_id)
+        schedule = self._daily_cache.peek((group_id, time_zone_id, today))
+        return None if schedule is None else self._render(group_id, time_zone_id, today, schedule)
+
+    async def peek_rendered_schedule_for_week(self, telegram_id: int) -> RenderedSchedule | None:
+        """Повертає розклад користувача на поточний тиждень лише з кешу (можливо, застарілий), без запиту до API."""
+        group_id, time_zone_id = await self._get_user_group_and_timezone(telegram_id)
+        today = get_today_in_zone(time_zone_id)
+        schedule = self._weekly_cache.peek((group_id, time_zone_id, today))
+        return None if schedule is None else self._render(group_id, time_zone_id, today, schedule)
+
+    def _cached_rendered(
+        self,
+        view: str,
+        group_id: int,
+        time_zone_id: str,
+        schedule_date: date | None
+    ) -> RenderedSchedule | None:
+        """
+        Повертає готовий текст, лише якщо кеш даних досі містить той самий DTO, з якого його сформовано:
+        щойно розклад застаріває або оновлюється, текст формується заново.
+        """
+        rendered = self._rendered_cache.get((group_id, time_zone_id, schedule_date, view))
+        if rendered is None:
+            return None
+        data_cache = self._daily_cache if view == 'daily' else self._weekly_cache
+        data_key = (group_id, time_zone_id, schedule_date)
+        if data_key in data_cache and data_cache.peek(data_key) is rendered.schedule:
+            return rendered
+        return None
+
+    def _render(
+        self,
+        group_id: int,
+        time_zone_id: str,
+        schedule_date: date | None,
+        schedule: DailyScheduleDTO | WeeklyScheduleDTO
+    ) -> RenderedSchedule:
+        if isinstance(schedule, WeeklyScheduleDTO):
+            view = 'weekly'
+            rendered = RenderedSchedule(
+                schedule, self._renderer.render_weekly(schedule), date.fromisoformat(schedule.week_start_date)
+            )
+        else:
+            view = 'daily'
+            rendered = RenderedSchedule(
+                schedule, self._renderer.render_daily(schedule), date.fromisoformat(schedule.date)
+            )
+        ttl = get_schedule_ttl(time_zone_id, schedule_date) if schedule_date else TODAY_SCHEDULE_TTL_SECONDS
+        self._rendered_cache.set((group_id, time_zone_id, schedule_date, view), rendered, ttl=ttl)
+        return rendered
+
+    def prefetch_adjacent(
+        self,
+        telegram_id: int,
+        current_date: date,
+        schedule_type: str,
+        semester_start: date | None = None,
+        semester_end: date | None = None
+    ) -> None:
+        """
+        Запускає у фоні попереднє завантаження сусіднього дня ("day") або тижня ("week"),
+        щоб наступне натискання ⬅️/➡️ обслуговувалось з кешу. Не блокує поточну відповідь.
+        """
+        if monotonic() < self._prefetch_paused_until:
+            return
+
+        step = timedelta(weeks=1) if schedule_type == "week" else timedelta(days=1)
+        targets = []
+        for target in (current_date + step, current_date - step):
+            if semester_start is not None and target < semester_start:
+                continue
+            if semester_end is not None and target > semester_end:
+                continue
+            targets.append(target)
+
+        if not targets:
+            return
+
+        task = asyncio.create_task(self._prefetch(telegram_id, targets, schedule_type == "week"))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def _prefetch(self, telegram_id: int, targets: List[date], weekly: bool) -> None:
+        try:
+            group_id, time_zone_id = await self._get_user_group_and_timezone(telegram_id)
+            for target in targets:
+                key = (group_id, time_zone_id, target)
+                if key in self._weekly_cache or (not weekly and key in self._daily_cache):
+                    continue
+
+                # Бюджет вичерпано або бекенд під навантаженням — просто відкидаємо передбачення.
+                if self._prefetch_semaphore.locked() or monotonic() < self._prefetch_paused_until:
+                    return
+
+                async with self._prefetch_semaphore:
+                    if weekly:
+                        await self.get_group_schedule_for_week(group_id, time_zone_id, target)
                     else:
-                        parts.append(f"  {pair_num}. 😴 Вікно")
-        
-        return "\n".join(parts)
\ No newline at end of file
+                        await self.get_group_schedule_for_day(group_id, time_zone_id, target)
+        except ResourceNotFoundError:
+            pass
+        except ApiClientError as e:
+            self._prefetch_paused_until = monotonic() + PREFETCH_BACKOFF_SECONDS
+            logger.warning("Schedule prefetch paused for %ds after API error: %s", PREFETCH_BACKOFF_SECONDS, e)
+        except ValueError:
+            pass
+        except Exception:
+            logger.exception("Unexpected error during schedule prefetch for user %d", telegram_id)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """Повертає метрики влучань/промахів кешів розкладу."""
+        return {
+            'daily': self._daily_cache.stats(),
+            'weekly': self._weekly_cache.stats(),
+            'rendered_schedule': self._rendered_cache.stats(),
+            **self._renderer.stats(),
+        }
+
+    def snapshot_sections(self) -> Dict[str, SnapshotSection]:
+        """
+        Тижневий розклад зберігається один раз на тиждень (під датою його початку),
+        а під час відновлення знову розкладається на всі дати тижня та денні записи.
+        """
+        return {
+            'daily_schedule': SnapshotSection(self._daily_cache, ScheduleCacheKey, DailyScheduleDTO),
+            'weekly_schedule': SnapshotSection(
+                self._weekly_cache,
+                ScheduleCacheKey,
+                WeeklyScheduleDTO,
+                include=lambda key, schedule: key[2] == date.fromisoformat(schedule.week_start_date),
+                restore=self._restore_week
+            ),
+        }
+
+    def _restore_week(self, key: ScheduleCacheKey, schedule: WeeklyScheduleDTO, ttl: float) -> None:
+        """Відновлює тиждень зі знімка із залишком його TTL; прострочені тижні ігноруються."""
+        if ttl > 0:
+            self._store_week(key[0], key[1], schedule, ttl=ttl)
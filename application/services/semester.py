@@ -1,53 +1,116 @@
-import time
+from bisect import bisect_right
 from datetime import date
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from api.dto import ApiSemesterDTO
 from api.gateways import SemesterGateway
+from application.cache import AsyncTTLCache
+from application.snapshot import SnapshotSection
+from config import settings
+
+
+def _parse_api_date(value: str) -> date:
+    return date.fromisoformat(value.split('T')[0])
+
+
+class SemesterBounds:
+    """Семестр разом із уже розібраними датами початку та кінця."""
+    __slots__ = ('semester', 'start', 'end', 'position')
+
+    def __init__(self, semester: ApiSemesterDTO, position: int = 0):
+        self.semester = semester
+        # Позиція семестру в списку з API.
+        self.position = position
+        self.start = _parse_api_date(semester.start_date)
+        self.end = _parse_api_date(semester.end_date)
+
+
+class _SemesterIndex:
+    """
+    Семестри, відсортовані за датою початку, для пошуку семестру за датою бінарним пошуком.
+    Будується один раз для кожного списку семестрів з кешу.
+    """
+    def __init__(self, semesters: List[ApiSemesterDTO]):
+        self.source = semesters
+        self.bounds = sorted(
+            (SemesterBounds(semester, position) for position, semester in enumerate(semesters)), key=lambda b: b.start
+        )
+        self.starts = [b.start for b in self.bounds]
+        # Найпізніший кінець серед семестрів до i-го включно: дозволяє коректно обробити перетин семестрів.
+        self.max_ends: List[date] = []
+        for b in self.bounds:
+            self.max_ends.append(max(self.max_ends[-1], b.end) if self.max_ends else b.end)
+        self.latest = max(self.bounds, key=lambda b: b.semester.start_date) if self.bounds else None
+
+    def find(self, for_date: date) -> SemesterBounds | None:
+        """
+        Семестр, що містить дату, або None. Якщо дату містять кілька семестрів (наприклад, спільний
+        день на межі), повертається перший з них у порядку списку з API, як і раніше при лінійному пошуку.
+        """
+        found: SemesterBounds | None = None
+        i = bisect_right(self.starts, for_date) - 1
+        while i >= 0 and self.max_ends[i] >= for_date:
+            b = self.bounds[i]
+            if b.end >= for_date and (found is None or b.position < found.position):
+                found = b
+            i -= 1
+        return found
 
-CACHE_TTL_SECONDS = 3600  # 1 година
 
 class SemesterService:
     def __init__(self, gateway: SemesterGateway):
         self._gateway = gateway
-        self._semesters_cache: Tuple[List[ApiSemesterDTO], float] | None = None
+        self._semesters_cache: AsyncTTLCache[str, List[ApiSemesterDTO]] = AsyncTTLCache(
+            name="semesters",
+            ttl=settings.reference_cache_ttl_seconds,
+            max_size=1,
+            max_staleness=settings.reference_cache_max_staleness_seconds
+        )
+        self._index: _SemesterIndex | None = None
+        # (дата, індекс, результат) останнього пошуку поточного семестру.
+        self._current: Tuple[date, _SemesterIndex, SemesterBounds | None] | None = None
 
     async def get_all_semesters(self) -> List[ApiSemesterDTO]:
         """Отримує всі семестри з API, використовуючи кеш з TTL."""
-        if self._semesters_cache is not None:
-            data, timestamp = self._semesters_cache
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return data
+        return await self._semesters_cache.get_or_load('all', self._load_semesters)
 
+    async def _load_semesters(self) -> List[ApiSemesterDTO]:
         response_data = await self._gateway.get_all_semesters()
         if not response_data:
-            self._semesters_cache = ([], time.time())
             return []
         
-        semesters = [ApiSemesterDTO.model_validate(semester) for semester in response_data]
-        self._semesters_cache = (semesters, time.time())
-        return semesters
+        return [ApiSemesterDTO.model_validate(semester) for semester in response_data]
 
-    async def get_current_semester(self) -> ApiSemesterDTO | None:
-        """
-        Знаходить поточний семестр (той, що включає сьогоднішню дату).
-        Якщо такого немає, повертає найближчий майбутній або останній минулий.
-        """
+    def cache_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """Повертає метрики кешу семестрів."""
+        return {'semesters': self._semesters_cache.stats()}
+
+    def snapshot_sections(self) -> Dict[str, SnapshotSection]:
+        return {'semesters': SnapshotSection(self._semesters_cache, str, List[ApiSemesterDTO])}
+
+    async def _get_index(self) -> _SemesterIndex:
+        """Повертає індекс семестрів, перебудовуючи його лише тоді, коли кеш віддав новий список."""
         semesters = await self.get_all_semesters()
-        if not semesters:
-            return None
+        if self._index is None or self._index.source is not semesters:
+            self._index = _SemesterIndex(semesters)
+        return self._index
 
+    async def semester_bounds(self, for_date: date | None = None) -> SemesterBounds | None:
+        """
+        Знаходить семестр, що включає дату (за замовчуванням — сьогодні).
+        Якщо такого немає, повертає семестр з найпізнішою датою початку.
+        Результат для сьогоднішньої дати запам'ятовується до зміни дати або списку семестрів.
+        """
+        index = await self._get_index()
         today = date.today()
-        current_semester = None
-        
-        for semester in semesters:
-            start_date = date.fromisoformat(semester.start_date.split('T')[0])
-            end_date = date.fromisoformat(semester.end_date.split('T')[0])
-            if start_date <= today <= end_date:
-                current_semester = semester
-                break
-        
-        if not current_semester and semesters:
-            return max(semesters, key=lambda s: s.start_date)
+        if for_date is None:
+            for_date = today
+
+        current = self._current
+        if for_date == today and current is not None and current[0] == today and current[1] is index:
+            return current[2]
 
-        return current_semester
\ No newline at end of file
+        bounds = index.find(for_date) or index.latest
+        if for_date == today:
+            self._current = (today, index, bounds)
+        return bounds
@@ -1,33 +1,38 @@
-import time
 from typing import List, Dict, Tuple
 from api import ApiSubjectNameDTO, ApiGroupedSubjectDetailsDTO, ResourceNotFoundError
 from api.gateways.subject_gateway import SubjectGateway
+from application.cache import AsyncTTLCache
+from application.snapshot import SnapshotSection
+from config import settings
 from .teacher import TeacherService
 
-CACHE_TTL_SECONDS = 3600  # 1 година
-
 class SubjectService:
     def __init__(self, gateway: SubjectGateway, teacher_service: TeacherService):
         self._gateway = gateway
         self._teacher_service = teacher_service
-        self._subjects_list_cache: Tuple[List[ApiSubjectNameDTO], float] | None = None
-        self._subject_details_cache: Dict[Tuple[int, int | None], Tuple[ApiGroupedSubjectDetailsDTO, float]] = {}
+        self._subjects_list_cache: AsyncTTLCache[str, List[ApiSubjectNameDTO]] = AsyncTTLCache(
+            name="subjects",
+            ttl=settings.reference_cache_ttl_seconds,
+            max_size=1,
+            max_staleness=settings.reference_cache_max_staleness_seconds
+        )
+        self._subject_details_cache: AsyncTTLCache[Tuple[int, int | None], ApiGroupedSubjectDetailsDTO] = AsyncTTLCache(
+            name="subject_details",
+            ttl=settings.reference_cache_ttl_seconds,
+            max_size=2048,
+            max_staleness=settings.reference_cache_max_staleness_seconds
+        )
 
     async def get_all_subjects(self) -> List[ApiSubjectNameDTO]:
         """Отримує список предметів, використовуючи кеш з TTL."""
-        if self._subjects_list_cache is not None:
-            data, timestamp = self._subjects_list_cache
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return data 
+        return await self._subjects_list_cache.get_or_load('all', self._load_subjects)
 
+    async def _load_subjects(self) -> List[ApiSubjectNameDTO]:
         response_data = await self._gateway.get_all_subjects()
         if not response_data:
             return []
         
-        subjects = [ApiSubjectNameDTO.model_validate(subject) for subject in response_data]
-        
-        self._subjects_list_cache = (subjects, time.time())
-        return subjects
+        return [ApiSubjectNameDTO.model_validate(subject) for subject in response_data]
 
     async def get_grouped_subject_details(
         self, 
@@ -35,22 +40,30 @@ class SubjectService:
         group_id: int | None = None
     ) -> ApiGroupedSubjectDetailsDTO | None:
         """Отримує деталі про предмет за ID його назви, використовуючи кеш."""
-        
-        cache_key = (subject_name_id, group_id)
-        if cache_key in self._subject_details_cache:
-            data, timestamp = self._subject_details_cache[cache_key]
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return data
+        async def load_details() -> ApiGroupedSubjectDetailsDTO:
+            response_data = await self._gateway.get_grouped_subject_details_by_id(subject_name_id, group_id)
+            return ApiGroupedSubjectDetailsDTO.model_validate(response_data)
 
         try:
-            response_data = await self._gateway.get_grouped_subject_details_by_id(subject_name_id, group_id)
-            details = ApiGroupedSubjectDetailsDTO.model_validate(response_data)
-            
-            self._subject_details_cache[cache_key] = (details, time.time())
-            return details
+            return await self._subject_details_cache.get_or_load((subject_name_id, group_id), load_details)
         except ResourceNotFoundError:
             return None
 
+    def cache_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """Повертає метрики кешів предметів."""
+        return {
+            'subjects': self._subjects_list_cache.stats(),
+            'subject_details': self._subject_details_cache.stats(),
+        }
+
+    def snapshot_sections(self) -> Dict[str, SnapshotSection]:
+        return {
+            'subjects': SnapshotSection(self._subjects_list_cache, str, List[ApiSubjectNameDTO]),
+            'subject_details': SnapshotSection(
+                self._subject_details_cache, Tuple[int, int | None], ApiGroupedSubjectDetailsDTO
+            ),
+        }
+
     def format_subject_details(self, subject: ApiGroupedSubjectDetailsDTO) -> str:
         header = f"📚 <b>{subject.name} ({subject.abbreviation})</b>"
         parts = [header]
@@ -1,48 +1,62 @@
-import time
 from typing import List, Tuple, Dict
 from api import ApiTeacherDTO, ResourceNotFoundError
 from api.gateways import TeacherGateway
 from api import ApiTeacherInfoDTO
-
-CACHE_TTL_SECONDS = 3600  # 1 година
+from application.cache import AsyncTTLCache
+from application.snapshot import SnapshotSection
+from config import settings
 
 class TeacherService:
     def __init__(self, gateway: TeacherGateway):
         self._gateway = gateway
-        self._teachers_list_cache: Tuple[List[ApiTeacherDTO], float] | None = None
-        self._teacher_details_cache: Dict[int, Tuple[ApiTeacherDTO, float]] = {}
+        self._teachers_list_cache: AsyncTTLCache[str, List[ApiTeacherDTO]] = AsyncTTLCache(
+            name="teachers",
+            ttl=settings.reference_cache_ttl_seconds,
+            max_size=1,
+            max_staleness=settings.reference_cache_max_staleness_seconds
+        )
+        self._teacher_details_cache: AsyncTTLCache[int, ApiTeacherDTO] = AsyncTTLCache(
+            name="teacher_details",
+            ttl=settings.reference_cache_ttl_seconds,
+            max_size=1024,
+            max_staleness=settings.reference_cache_max_staleness_seconds
+        )
 
     async def get_all_teachers(self) -> List[ApiTeacherDTO]:
         """Отримує список всіх викладачів, використовуючи кеш з TTL."""
-        if self._teachers_list_cache is not None:
-            data, timestamp = self._teachers_list_cache
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return data
+        return await self._teachers_list_cache.get_or_load('all', self._load_teachers)
 
+    async def _load_teachers(self) -> List[ApiTeacherDTO]:
         response_data = await self._gateway.get_all_teachers()
         if not response_data:
-            self._teachers_list_cache = ([], time.time())
             return []
             
-        teachers = [ApiTeacherDTO.model_validate(teacher) for teacher in response_data]
-        self._teachers_list_cache = (teachers, time.time())
-        return teachers
+        return [ApiTeacherDTO.model_validate(teacher) for teacher in response_data]
 
     async def get_teacher_by_id(self, teacher_id: int) -> ApiTeacherDTO | None:
         """Отримує деталі про викладача за його ID, використовуючи кеш з TTL."""
-        if teacher_id in self._teacher_details_cache:
-            data, timestamp = self._teacher_details_cache[teacher_id]
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return data
+        async def load_teacher() -> ApiTeacherDTO:
+            response_data = await self._gateway.get_teacher_by_id(teacher_id)
+            return ApiTeacherDTO.model_validate(response_data)
 
         try:
-            response_data = await self._gateway.get_teacher_by_id(teacher_id)
-            teacher = ApiTeacherDTO.model_validate(response_data)
-            self._teacher_details_cache[teacher_id] = (teacher, time.time())
-            return teacher
+            return await self._teacher_details_cache.get_or_load(teacher_id, load_teacher)
         except ResourceNotFoundError:
             return None
 
+    def cache_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """Повертає метрики кешів викладачів."""
+        return {
+            'teachers': self._teachers_list_cache.stats(),
+            'teacher_details': self._teacher_details_cache.stats(),
+        }
+
+    def snapshot_sections(self) -> Dict[str, SnapshotSection]:
+        return {
+            'teachers': SnapshotSection(self._teachers_list_cache, str, List[ApiTeacherDTO]),
+            'teacher_details': SnapshotSection(self._teacher_details_cache, int, ApiTeacherDTO),
+        }
+
     def extract_photo_and_infos(self, teacher: ApiTeacherDTO) -> Tuple[str | None, List[ApiTeacherInfoDTO]]:
         """
         Витягує URL фотографії та решту інформації зі списку infos.
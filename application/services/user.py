@@ -1,32 +1,63 @@
-import time
-from typing import Dict, Tuple
+from typing import Dict
 from api import ApiCreateUserDTO, ApiUserDTO, ResourceNotFoundError
 from api.gateways import UserGateway
+from application.cache import TTLCache
 
 CACHE_TTL_SECONDS = 3600  # 1 година
+CACHE_MAX_SIZE = 10_000
+CACHE_SWEEP_INTERVAL_SECONDS = 300
+# Незареєстровані користувачі кешуються ненадовго, щоб реєстрація не "застрягала".
+NOT_REGISTERED_TTL_SECONDS = 60
+NOT_REGISTERED_CACHE_MAX_SIZE = 5_000
 
 class UserService:
     def __init__(self, gateway: UserGateway):
         self._gateway = gateway
-        self._user_cache: Dict[int, Tuple[ApiUserDTO, float]] = {}
+        self._user_cache: TTLCache[int, ApiUserDTO] = TTLCache(
+            max_size=CACHE_MAX_SIZE,
+            default_ttl=CACHE_TTL_SECONDS,
+            name="users",
+            sweep_interval=CACHE_SWEEP_INTERVAL_SECONDS
+        )
+        self._not_registered_cache: TTLCache[int, bool] = TTLCache(
+            max_size=NOT_REGISTERED_CACHE_MAX_SIZE,
+            default_ttl=NOT_REGISTERED_TTL_SECONDS,
+            name="not_registered_users",
+            sweep_interval=CACHE_SWEEP_INTERVAL_SECONDS
+        )
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> ApiUserDTO | None:
-        """Отримує користувача за telegram_id, використовуючи кеш з TTL."""
-        if telegram_id in self._user_cache:
-            user_dto, timestamp = self._user_cache[telegram_id]
-            if time.time() - timestamp < CACHE_TTL_SECONDS:
-                return user_dto
+        """Отримує користувача за telegram_id, використовуючи кеш з TTL (у т.ч. для незареєстрованих)."""
+        user_dto = self._user_cache.get(telegram_id)
+        if user_dto is not None:
+            return user_dto
+
+        if self._not_registered_cache.get(telegram_id):
+            return None
 
         try:
             user_data = await self._gateway.get_user_by_telegram_id(telegram_id)
             user_dto = ApiUserDTO.model_validate(user_data)
             
-            self._user_cache[telegram_id] = (user_dto, time.time())
+            self._user_cache.set(telegram_id, user_dto)
             return user_dto
             
         except ResourceNotFoundError:
+            self._not_registered_cache.set(telegram_id, True)
             return None
 
+    def invalidate_user(self, telegram_id: int) -> None:
+        """Видаляє користувача з кешу (як позитивного, так і негативного)."""
+        self._user_cache.pop(telegram_id)
+        self._not_registered_cache.pop(telegram_id)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """Повертає метрики кешу користувачів."""
+        return {
+            'users': self._user_cache.stats(),
+            'not_registered': self._not_registered_cache.stats(),
+        }
+
     async def register_new_user(self, telegram_id: int, username: str | None, group_id_str: str, region_id_str: str) -> str:
         """Реєструє нового користувача."""
         try:
@@ -43,7 +74,10 @@ class UserService:
             isAdmin=False
         )
 
-        await self._gateway.create_user(user_data=user_dto.model_dump(by_alias=True))
+        try:
+            await self._gateway.create_user(user_data=user_dto.model_dump(by_alias=True))
+        finally:
+            self.invalidate_user(telegram_id)
 
         return f"✅ Вас успішно зареєстровано!"
 
@@ -55,8 +89,7 @@ class UserService:
         
         await self._gateway.change_user_group(user_id=user.id, new_group_id=new_group_id)
 
-        if telegram_id in self._user_cache:
-            del self._user_cache[telegram_id]
+        self.invalidate_user(telegram_id)
 
     async def change_user_region(self, telegram_id: int, new_region_id: int) -> None:
         """Змінює регіон для користувача та інвалідує кеш."""
@@ -66,5 +99,4 @@ class UserService:
         
         await self._gateway.change_user_region(user_id=user.id, new_region_id=new_region_id)
 
-        if telegram_id in self._user_cache:
-            del self._user_cache[telegram_id]
\ No newline at end of file
+        self.invalidate_user(telegram_id)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import logging
+import math
+from abc import ABC, abstractmethod
+from typing import List, Mapping, Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY_PREFIX = "schedulebot:"
+
+
+class SharedCacheBackend(ABC):
+    """
+    Кеш другого рівня, спільний для всіх реплік бота: зберігає серіалізовані значення з TTL.
+    Недоступність бекенду не повинна ламати бота, тому реалізації повертають промахи замість помилок.
+    """
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> List[bytes | None]:
+        """Повертає значення для кожного ключа (None, якщо ключа немає) за один запит."""
+
+    @abstractmethod
+    async def set_many(self, items: Mapping[str, bytes], ttl: float) -> None:
+        """Зберігає всі значення з однаковим TTL за один запит."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def get(self, key: str) -> bytes | None:
+        return (await self.get_many([key]))[0]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisSharedCache(SharedCacheBackend):
+    """
+    Спільний кеш у Redis (або будь-якому сервері з протоколом Redis).
+    Читання кількох ключів — один MGET, запис — один конвеєр SET ... EX без транзакції.
+    """
+    def __init__(self, redis: Redis, prefix: str = DEFAULT_KEY_PREFIX):
+        self._redis = redis
+        self._prefix = prefix
+
+    async def get_many(self, keys: Sequence[str]) -> List[bytes | None]:
+        if not keys:
+            return []
+        try:
+            return await self._redis.mget([self._prefix + key for key in keys])
+        except RedisError as e:
+            logger.warning("Shared cache read failed, treating as miss: %s", e)
+            return [None] * len(keys)
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: float) -> None:
+        if not items or ttl <= 0:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self._prefix + key, value, ex=math.ceil(ttl))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self._redis.delete(*(self._prefix + key for key in keys))
+        except RedisError as e:
+            logger.warning("Shared cache delete failed: %s", e)
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+from pydantic import TypeAdapter, ValidationError
+
+from application.cache import AsyncTTLCache, TTLCache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class SnapshotSection:
+    """
+    Описує, як зберегти та відновити один кеш сервісу.
+    :param key_type: Тип ключа кешу (для серіалізації в JSON та назад).
+    :param value_type: Тип значення кешу, наприклад List[ApiGroupDTO].
+    :param include: Необов'язковий фільтр записів, які потрапляють у знімок.
+    :param restore: Необов'язковий обробник відновлення замість cache.restore.
+    """
+    def __init__(
+        self,
+        cache: TTLCache | AsyncTTLCache,
+        key_type: Any,
+        value_type: Any,
+        include: Callable[[Any, Any], bool] | None = None,
+        restore: Callable[[Any, Any, float], None] | None = None
+    ):
+        self.cache = cache
+        self.key_adapter = TypeAdapter(key_type)
+        self.value_adapter = TypeAdapter(value_type)
+        self.include = include
+        self.restore = restore or cache.restore
+
+
+class CacheSnapshotStore:
+    """
+    Зберігає вміст кешів сервісів у локальний файл формату JSON Lines і відновлює його під час запуску,
+    щоб після перезапуску бот одразу віддавав дані з кешу, а оновлював їх поступово.
+    """
+    def __init__(self, path: str, sections: Dict[str, SnapshotSection]):
+        self._path = path
+        self._sections = sections
+
+    def _encode(self) -> List[str]:
+        lines = [json.dumps({'version': SNAPSHOT_FORMAT_VERSION, 'saved_at': time.time()})]
+        for name, section in self._sections.items():
+            for key, value, ttl in section.cache.entries():
+                if section.include is not None and not section.include(key, value):
+                    continue
+                record = {
+                    'cache': name,
+                    'key': section.key_adapter.dump_python(key, mode='json', by_alias=True),
+                    'value': section.value_adapter.dump_python(value, mode='json', by_alias=True),
+                    'ttl': round(ttl, 1),
+                }
+                lines.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        return lines
+
+    def _write(self, lines: Iterable[str]) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line)
+                f.write('\n')
+        os.replace(tmp_path, self._path)
+
+    async def save(self) -> int:
+        """Зберігає знімок усіх кешів та повертає кількість збережених записів."""
+        lines = self._encode()
+        await asyncio.to_thread(self._write, lines)
+        return len(lines) - 1
+
+    def load(self) -> int:
+        """Відновлює кеші зі знімка та повертає кількість відновлених записів."""
+        try:
+            with open(self._path, encoding='utf-8') as f:
+                header = json.loads(f.readline() or '{}')
+                if header.get('version') != SNAPSHOT_FORMAT_VERSION:
+                    logger.warning("Ignoring cache snapshot %s with unsupported version %s", self._path, header.get('version'))
+                    return 0
+
+                elapsed = max(time.time() - header.get('saved_at', 0), 0)
+                restored = 0
+                for line in f:
+                    if self._restore_line(line, elapsed):
+                        restored += 1
+                return restored
+        except FileNotFoundError:
+            return 0
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Could not read cache snapshot %s: %s", self._path, e)
+            return 0
+
+    def _restore_line(self, line: str, elapsed: float) -> bool:
+        try:
+            record = json.loads(line)
+            section = self._sections.get(record['cache'])
+            if section is None:
+                return False
+            key = section.key_adapter.validate_python(record['key'])
+            value = section.value_adapter.validate_python(record['value'])
+        except (json.JSONDecodeError, KeyError, ValidationError) as e:
+            logger.warning("Skipping corrupted cache snapshot record: %s", e)
+            return False
+
+        section.restore(key, value, record['ttl'] - elapsed)
+        return True
+
+    async def run_periodically(self, interval_seconds: float) -> None:
+        """Періодично зберігає знімок кешів, доки задачу не буде скасовано."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                saved = await self.save()
+                logger.debug("Cache snapshot saved: %d entries", saved)
+            except Exception:
+                logger.exception("Failed to save cache snapshot to %s", self._path)
+
+
+def collect_snapshot_sections(*providers: Any) -> Dict[str, SnapshotSection]:
+    """Збирає секції знімка з усіх сервісів, що мають метод snapshot_sections()."""
+    sections: Dict[str, SnapshotSection] = {}
+    for provider in providers:
+        sections.update(provider.snapshot_sections())
+    return sections
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from collections import Counter
+from time import monotonic
+from typing import Any, Awaitable, Dict, List
+
+from application.services import (GroupService, RegionService, ScheduleService,
+                                  SemesterService, SubjectService, TeacherService)
+
+logger = logging.getLogger(__name__)
+
+# Скільки груп одночасно прогріваються під час попереднього завантаження розкладу.
+SCHEDULE_WARMUP_CONCURRENCY = 8
+
+
+async def _warm_schedules(
+    group_service: GroupService,
+    region_service: RegionService,
+    schedule_service: ScheduleService,
+    time_zone_id: str | None
+) -> List[Any]:
+    """
+    Завантажує розклад на сьогодні та поточний тиждень для кожної групи в одному часовому поясі:
+    time_zone_id або, якщо його не задано, поясі, до якого належить найбільше регіонів.
+    Прогрів кожного поясу множив би кількість запитів до API на кількість поясів.
+    """
+    groups, regions = await asyncio.gather(group_service.get_all_groups(), region_service.get_all_regions())
+    if time_zone_id is None:
+        if not regions:
+            return []
+        time_zone_id = Counter(region.time_zone_id for region in regions).most_common(1)[0][0]
+    semaphore = asyncio.Semaphore(SCHEDULE_WARMUP_CONCURRENCY)
+    warmed = []
+
+    async def warm_group(group_id: int, time_zone_id: str) -> None:
+        async with semaphore:
+            try:
+                await schedule_service.get_group_schedule_for_week(group_id, time_zone_id)
+                await schedule_service.get_group_schedule_for_day(group_id, time_zone_id)
+                warmed.append((group_id, time_zone_id))
+            except Exception as e:
+                logger.warning("Warm-up: failed to preload schedule for group %d (%s): %s", group_id, time_zone_id, e)
+
+    await asyncio.gather(*(warm_group(group.id, time_zone_id) for group in groups))
+    return warmed
+
+
+async def warm_up_caches(
+    group_service: GroupService,
+    region_service: RegionService,
+    semester_service: SemesterService,
+    teacher_service: TeacherService,
+    subject_service: SubjectService,
+    schedule_service: ScheduleService,
+    preload_schedules: bool,
+    deadline_seconds: float,
+    schedule_time_zone_id: str | None = None
+) -> None:
+    """
+    Паралельно прогріває кеші довідкових даних (і, за бажанням, розкладу) до початку обробки оновлень.
+    Етапи, що не встигли за deadline_seconds, скасовуються — бот стартує з тим, що вже завантажено.
+    """
+    started_at = monotonic()
+    report: Dict[str, str] = {}
+
+    async def run_step(name: str, awaitable: Awaitable[List[Any]]) -> None:
+        step_started_at = monotonic()
+        try:
+            result = await awaitable
+            report[name] = f"{monotonic() - step_started_at:.2f}s, {len(result)} items"
+        except Exception as e:
+            report[name] = f"failed after {monotonic() - step_started_at:.2f}s: {e}"
+
+    steps = {
+        'groups': group_service.get_all_groups(),
+        'regions': region_service.get_all_regions(),
+        'semesters': semester_service.get_all_semesters(),
+        'teachers': teacher_service.get_all_teachers(),
+        'subjects': subject_service.get_all_subjects(),
+    }
+    if preload_schedules:
+        steps['schedules'] = _warm_schedules(
+            group_service, region_service, schedule_service, schedule_time_zone_id
+        )
+
+    tasks = {name: asyncio.create_task(run_step(name, awaitable)) for name, awaitable in steps.items()}
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline_seconds)
+
+    for name, task in tasks.items():
+        if task in pending:
+            task.cancel()
+            report[name] = f"timed out after {deadline_seconds:g}s"
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    logger.info("Cache warm-up finished in %.2fs:", monotonic() - started_at)
+    for name in steps:
+        logger.info("  %-10s %s", name, report.get(name, "not run"))
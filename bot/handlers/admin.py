@@ -1,12 +1,15 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Set
 
 from aiogram import F, Router, types, Bot
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import BufferedInputFile, Message, CallbackQuery
 from aiogram.filters import BaseFilter
-from aiogram.exceptions import TelegramBadRequest
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 
+from application.broadcasting import BroadcastStats
 from application.services import UserService, BroadcastService
 from bot.fsm import BroadcastFSM
 from bot.keyboards import (create_admin_panel_keyboard, create_broadcast_confirmation_keyboard,
@@ -15,6 +18,8 @@ from bot.keyboards import BroadcastCallbackFactory
 
 logger = logging.getLogger(__name__)
 admin_router = Router(name="admin_router")
+# Посилання на фонові розсилки, щоб задачі не були зібрані збирачем сміття до завершення.
+_broadcast_tasks: Set[asyncio.Task] = set()
 
 class AdminFilter(BaseFilter):
     async def __call__(self, event: types.Message | types.CallbackQuery, user_service: UserService) -> bool:
@@ -23,6 +28,26 @@ class AdminFilter(BaseFilter):
         user = await user_service.get_user_by_telegram_id(event.from_user.id)
         return user is not None and user.is_admin
 
+async def _run_broadcast(broadcast_service: BroadcastService, bot: Bot, status_message: Message) -> None:
+    """Виконує розсилку, оновлюючи повідомлення зі статусом, а наприкінці замінює його звітом."""
+    async def show_progress(stats: BroadcastStats) -> None:
+        try:
+            await status_message.edit_text(broadcast_service.format_progress(stats))
+        except (TelegramBadRequest, TelegramRetryAfter):
+            # Текст не змінився або Telegram просить зачекати — покажемо прогрес наступного разу.
+            pass
+
+    try:
+        send_result = await broadcast_service.send_pending_broadcast(bot, on_progress=show_progress)
+    except Exception:
+        logger.exception("Broadcast started from the admin panel failed")
+        send_result = "❌ Під час розсилки сталася непередбачена помилка. Подробиці — в логах."
+
+    try:
+        await status_message.edit_text(send_result)
+    except (TelegramBadRequest, TelegramRetryAfter):
+        await status_message.answer(send_result)
+
 @admin_router.message(F.text == "👑 Адмін-панель", AdminFilter())
 async def handle_admin_panel(message: Message):
     await message.answer("Вітаємо в адмін-панелі!", reply_markup=create_admin_panel_keyboard())
@@ -37,6 +62,25 @@ async def handle_close_admin_panel(query: CallbackQuery):
             logger.warning("Could not delete admin panel message.")
     await query.answer()
 
+@admin_router.callback_query(F.data == "export_unreachable_recipients", AdminFilter())
+async def handle_export_unreachable_recipients(query: CallbackQuery, broadcast_service: BroadcastService):
+    export = broadcast_service.export_unreachable_recipients()
+    if export is None:
+        await query.answer("Облік недоступних отримувачів вимкнено.", show_alert=True)
+        return
+
+    count, csv_text = export
+    if not count:
+        await query.answer("Недоступних отримувачів немає.", show_alert=True)
+        return
+
+    if isinstance(query.message, Message):
+        await query.message.answer_document(
+            BufferedInputFile(csv_text.encode('utf-8'), filename="unreachable_recipients.csv"),
+            caption=f"🚷 Недоступних отримувачів: {count}. Їх буде пропущено в наступних розсилках."
+        )
+    await query.answer()
+
 @admin_router.callback_query(F.data == "start_broadcast", AdminFilter())
 async def handle_start_broadcast(query: CallbackQuery, state: FSMContext):
     if isinstance(query.message, Message):
@@ -92,7 +136,8 @@ async def handle_get_schedule_time(message: Message, state: FSMContext):
             await message.reply("❌ Помилка: вказаний час вже минув. Введіть майбутню дату та час.")
             return
 
-        await state.update_data(schedule_time=schedule_dt_utc)
+        # Дані FSM мають бути JSON-сумісними (RedisStorage), тому час зберігається в ISO-форматі.
+        await state.update_data(schedule_time=schedule_dt_utc.isoformat())
         await state.set_state(BroadcastFSM.getting_message)
         await message.answer(
             f"✅ Час заплановано на {schedule_dt_utc.strftime('%Y-%m-%d %H:%M %Z')}.\n\n"
@@ -114,10 +159,11 @@ async def show_confirmation_preview(bot: Bot, chat_id: int, state: FSMContext):
     data = await state.get_data()
     message_text = data.get("message_text", "Текст не встановлено.")
     is_scheduled = data.get("is_scheduled", False)
-    schedule_time: datetime | None = data.get("schedule_time")
+    schedule_time_iso: str | None = data.get("schedule_time")
 
     preview_text = "<b><u>Попередній перегляд розсилки</u></b>\n\n"
-    if is_scheduled and schedule_time:
+    if is_scheduled and schedule_time_iso:
+        schedule_time = datetime.fromisoformat(schedule_time_iso)
         preview_text += f"🕒 <b>Заплановано на:</b> {schedule_time.strftime('%Y-%m-%d %H:%M %Z')}\n\n"
     else:
         preview_text += "🚀 <b>Тип відправки:</b> Негайно\n\n"
@@ -188,16 +234,17 @@ async def handle_broadcast_confirmation(
             await query.answer()
             return
 
-        schedule_time_obj: datetime | None = data.get("schedule_time")
-        schedule_time_iso = schedule_time_obj.isoformat() if schedule_time_obj else None
+        schedule_time_iso: str | None = data.get("schedule_time")
         
         creation_result = await broadcast_service.create_broadcast(message_text, schedule_time_iso)
         await query.message.answer(creation_result)
 
         if not is_scheduled:
-            await query.message.answer("🚀 Починаю розсилку...")
-            send_result = await broadcast_service.send_pending_broadcast(bot)
-            await query.message.answer(send_result)
+            status_message = await query.message.answer("🚀 Починаю розсилку...")
+            # Розсилка триває хвилинами, тому виконується у фоні й не займає чергу оновлень адміна.
+            task = asyncio.create_task(_run_broadcast(broadcast_service, bot, status_message))
+            _broadcast_tasks.add(task)
+            task.add_done_callback(_broadcast_tasks.discard)
 
         await state.clear()
         
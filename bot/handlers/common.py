@@ -6,7 +6,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 from aiogram.exceptions import TelegramBadRequest
 
-from application.services import GroupService, UserService
+from application.services import BroadcastService, GroupService, UserService
 from bot.fsm import RegistrationFSM
 from bot.keyboards import create_groups_keyboard, create_main_keyboard
 
@@ -20,6 +20,7 @@ async def handle_start(
     message: Message, 
     group_service: GroupService, 
     user_service: UserService,
+    broadcast_service: BroadcastService,
     state: FSMContext
 ):
     """
@@ -28,6 +29,9 @@ async def handle_start(
     """
     if not message.from_user:
         return
+
+    # Користувач, що натиснув /start, точно не блокує бота — повертаємо його до розсилок.
+    broadcast_service.mark_recipient_reachable(message.from_user.id)
     
     try:
         user = await user_service.get_user_by_telegram_id(message.from_user.id)
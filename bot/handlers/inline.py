@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from datetime import date
+from typing import Any, Awaitable, Callable
 from uuid import uuid4
 
 from aiogram import Bot, Router
@@ -14,6 +15,27 @@ logger = logging.getLogger(__name__)
 inline_router = Router(name="inline_router")
 
 
+# Загальний час на збирання інлайн-відповіді; після нього відповідаємо тим, що встигло завантажитись.
+INLINE_ANSWER_DEADLINE_SECONDS = 3.0
+
+
+def _finish_in_background(task: asyncio.Task) -> None:
+    """Дозволяє незавершеній задачі доробити (і наповнити кеш), не залишаючи неотриманих винятків."""
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _resolve(task: asyncio.Task, fallback: Callable[[], Awaitable[Any]] | None = None) -> Any:
+    """
+    Повертає результат завершеної задачі (або піднімає її виняток).
+    Для незавершеної задачі повертає результат fallback (наприклад, дані з кешу) або None.
+    """
+    if task.done():
+        return task.result()
+
+    _finish_in_background(task)
+    return await fallback() if fallback else None
+
+
 @inline_router.inline_query()
 async def handle_inline_query(
     query: InlineQuery,
@@ -25,41 +47,58 @@ async def handle_inline_query(
     """
     Обробляє інлайн-запити.
     - Для зареєстрованих користувачів пропонує надіслати розклад на день та на тиждень.
+      Розклад на день, на тиждень та семестр завантажуються паралельно з загальним дедлайном.
     - Для незареєстрованих — пропонує перейти в бот для реєстрації.
     """
     results = []
+    cache_time = 10
     user_id = query.from_user.id
     user = await user_service.get_user_by_telegram_id(user_id)
 
     if user:
+        daily_task = asyncio.create_task(schedule_service.get_rendered_schedule_for_day(user_id))
+        weekly_task = asyncio.create_task(schedule_service.get_rendered_schedule_for_week(user_id))
+        semester_task = asyncio.create_task(semester_service.semester_bounds())
+        _, pending = await asyncio.wait(
+            {daily_task, weekly_task, semester_task}, timeout=INLINE_ANSWER_DEADLINE_SECONDS
+        )
+        if pending:
+            # Неповну відповідь Telegram не повинен кешувати.
+            cache_time = 0
+
+        semester_start = semester_end = None
         try:
-            schedule_dto = await schedule_service.get_schedule_for_day(user_id)
-            response_text = schedule_service.format_schedule_message(schedule_dto)
-            current_schedule_date = date.fromisoformat(schedule_dto.date)
-            
-            semester = await semester_service.get_current_semester()
-            semester_start = date.fromisoformat(semester.start_date.split('T')[0]) if semester else None
-            semester_end = date.fromisoformat(semester.end_date.split('T')[0]) if semester else None
-
-            keyboard = create_schedule_navigation_keyboard(
-                current_schedule_date, 
-                original_user_id=user_id,
-                semester_start=semester_start,
-                semester_end=semester_end
-            )
+            semester = await _resolve(semester_task)
+            if semester:
+                semester_start = semester.start
+                semester_end = semester.end
+        except Exception:
+            logger.exception("Failed to get current semester for inline query of user %d", user_id)
 
-            schedule_result = InlineQueryResultArticle(
-                id=str(uuid4()),
-                title="🗓 Мій розклад на сьогодні",
-                description="Натисніть, щоб надіслати розклад у цей чат.",
-                input_message_content=InputTextMessageContent(
-                    message_text=response_text,
-                    parse_mode="HTML",
-                    link_preview_options=LinkPreviewOptions(is_disabled=True)
-                ),
-                reply_markup=keyboard
-            )
-            results.append(schedule_result)
+        try:
+            rendered = await _resolve(daily_task, lambda: schedule_service.peek_rendered_schedule_for_day(user_id))
+            if rendered:
+                keyboard = create_schedule_navigation_keyboard(
+                    rendered.schedule_date,
+                    original_user_id=user_id,
+                    semester_start=semester_start,
+                    semester_end=semester_end
+                )
+
+                schedule_result = InlineQueryResultArticle(
+                    id=str(uuid4()),
+                    title="🗓 Мій розклад на сьогодні",
+                    description="Натисніть, щоб надіслати розклад у цей чат.",
+                    input_message_content=InputTextMessageContent(
+                        message_text=rendered.text,
+                        parse_mode="HTML",
+                        link_preview_options=LinkPreviewOptions(is_disabled=True)
+                    ),
+                    reply_markup=keyboard
+                )
+                results.append(schedule_result)
+            else:
+                logger.warning("Inline daily schedule for user %d missed the deadline", user_id)
 
         except (ValueError, ResourceNotFoundError) as e:
             error_result = InlineQueryResultArticle(
@@ -73,33 +112,29 @@ async def handle_inline_query(
             logger.exception("Failed to create inline daily schedule for user %d", user_id)
 
         try:
-            weekly_schedule_dto = await schedule_service.get_schedule_for_week(user_id)
-            response_text = schedule_service.format_weekly_schedule_message(weekly_schedule_dto)
-            current_schedule_date = date.fromisoformat(weekly_schedule_dto.week_start_date)
-            
-            semester = await semester_service.get_current_semester()
-            semester_start = date.fromisoformat(semester.start_date.split('T')[0]) if semester else None
-            semester_end = date.fromisoformat(semester.end_date.split('T')[0]) if semester else None
-
-            keyboard = create_weekly_schedule_navigation_keyboard(
-                current_schedule_date, 
-                original_user_id=user_id,
-                semester_start=semester_start,
-                semester_end=semester_end
-            )
+            rendered = await _resolve(weekly_task, lambda: schedule_service.peek_rendered_schedule_for_week(user_id))
+            if rendered:
+                keyboard = create_weekly_schedule_navigation_keyboard(
+                    rendered.schedule_date,
+                    original_user_id=user_id,
+                    semester_start=semester_start,
+                    semester_end=semester_end
+                )
 
-            weekly_schedule_result = InlineQueryResultArticle(
-                id=str(uuid4()),
-                title="🗓 Мій розклад на тиждень",
-                description="Натисніть, щоб надіслати розклад на весь тиждень.",
-                input_message_content=InputTextMessageContent(
-                    message_text=response_text,
-                    parse_mode="HTML",
-                    link_preview_options=LinkPreviewOptions(is_disabled=True)
-                ),
-                reply_markup=keyboard
-            )
-            results.append(weekly_schedule_result)
+                weekly_schedule_result = InlineQueryResultArticle(
+                    id=str(uuid4()),
+                    title="🗓 Мій розклад на тиждень",
+                    description="Натисніть, щоб надіслати розклад на весь тиждень.",
+                    input_message_content=InputTextMessageContent(
+                        message_text=rendered.text,
+                        parse_mode="HTML",
+                        link_preview_options=LinkPreviewOptions(is_disabled=True)
+                    ),
+                    reply_markup=keyboard
+                )
+                results.append(weekly_schedule_result)
+            else:
+                logger.warning("Inline weekly schedule for user %d missed the deadline", user_id)
         except Exception:
             logger.exception("Failed to create inline weekly schedule for user %d", user_id)
 
@@ -128,6 +163,6 @@ async def handle_inline_query(
 
     await query.answer(
         results=results,
-        cache_time=10,
+        cache_time=cache_time,
         is_personal=True
     )
\ No newline at end of file
@@ -26,24 +26,21 @@ async def handle_get_schedule(message: Message, schedule_service: ScheduleServic
     telegram_id = message.from_user.id
     
     try:
-        schedule_dto = await schedule_service.get_schedule_for_day(telegram_id)
-        response_text = schedule_service.format_schedule_message(schedule_dto)
-        
-        current_schedule_date = date.fromisoformat(schedule_dto.date)
+        rendered = await schedule_service.get_rendered_schedule_for_day(telegram_id)
 
-        semester = await semester_service.get_current_semester()
-        semester_start = date.fromisoformat(semester.start_date.split('T')[0]) if semester else None
-        semester_end = date.fromisoformat(semester.end_date.split('T')[0]) if semester else None
+        semester = await semester_service.semester_bounds()
+        semester_start = semester.start if semester else None
+        semester_end = semester.end if semester else None
 
         keyboard = create_schedule_navigation_keyboard(
-            current_schedule_date, 
+            rendered.schedule_date,
             original_user_id=telegram_id,
             semester_start=semester_start,
             semester_end=semester_end
         )
         
         await message.answer(
-            response_text, 
+            rendered.text,
             reply_markup=keyboard,
             link_preview_options=LinkPreviewOptions(is_disabled=True)
         )
@@ -69,24 +66,21 @@ async def handle_get_weekly_schedule(message: Message, schedule_service: Schedul
     telegram_id = message.from_user.id
     
     try:
-        schedule_dto = await schedule_service.get_schedule_for_week(telegram_id)
-        response_text = schedule_service.format_weekly_schedule_message(schedule_dto)
-        
-        current_schedule_date = date.fromisoformat(schedule_dto.week_start_date)
+        rendered = await schedule_service.get_rendered_schedule_for_week(telegram_id)
 
-        semester = await semester_service.get_current_semester()
-        semester_start = date.fromisoformat(semester.start_date.split('T')[0]) if semester else None
-        semester_end = date.fromisoformat(semester.end_date.split('T')[0]) if semester else None
+        semester = await semester_service.semester_bounds()
+        semester_start = semester.start if semester else None
+        semester_end = semester.end if semester else None
 
         keyboard = create_weekly_schedule_navigation_keyboard(
-            current_schedule_date, 
+            rendered.schedule_date,
             original_user_id=telegram_id,
             semester_start=semester_start,
             semester_end=semester_end
         )
         
         await message.answer(
-            response_text, 
+            rendered.text,
             reply_markup=keyboard,
             link_preview_options=LinkPreviewOptions(is_disabled=True)
         )
@@ -149,9 +143,9 @@ async def handle_show_schedule(
         
     telegram_id = callback_data.original_user_id
     
-    semester = await semester_service.get_current_semester()
-    semester_start = date.fromisoformat(semester.start_date.split('T')[0]) if semester else None
-    semester_end = date.fromisoformat(semester.end_date.split('T')[0]) if semester else None
+    semester = await semester_service.semester_bounds()
+    semester_start = semester.start if semester else None
+    semester_end = semester.end if semester else None
     
     if callback_data.schedule_type == "week":
         await edit_inline_weekly_schedule_for_date(
@@ -185,13 +179,13 @@ async def handle_schedule_navigation(
     bot: Bot
 ):
     """Обробляє навігацію по днях та тижнях розкладу для звичайних та інлайн-повідомлень."""
-    semester = await semester_service.get_current_semester()
+    semester = await semester_service.semester_bounds()
     if not semester:
         await query.answer("Не вдалося знайти активний семестр.", show_alert=True)
         return
 
-    semester_start = date.fromisoformat(semester.start_date.split('T')[0])
-    semester_end = date.fromisoformat(semester.end_date.split('T')[0])
+    semester_start = semester.start
+    semester_end = semester.end
     current_date = date.fromisoformat(callback_data.current_date)
     
     target_date: date
@@ -233,7 +227,15 @@ async def handle_schedule_navigation(
         logger.warning(
             "Attempted to navigate schedule on a message with no context"
         )
+        return
 
+    schedule_service.prefetch_adjacent(
+        telegram_id=callback_data.original_user_id,
+        current_date=target_date,
+        schedule_type=callback_data.schedule_type,
+        semester_start=semester_start,
+        semester_end=semester_end
+    )
     await query.answer()
 
 async def edit_schedule_for_date(
@@ -249,8 +251,7 @@ async def edit_schedule_for_date(
         return
 
     try:
-        schedule_dto = await schedule_service.get_schedule_for_day(telegram_id, target_date)
-        response_text = schedule_service.format_schedule_message(schedule_dto)
+        rendered = await schedule_service.get_rendered_schedule_for_day(telegram_id, target_date)
         keyboard = create_schedule_navigation_keyboard(
             target_date, 
             original_user_id=telegram_id,
@@ -258,7 +259,7 @@ async def edit_schedule_for_date(
             semester_end=semester_end
         )
         await message.edit_text(
-            response_text, 
+            rendered.text,
             reply_markup=keyboard,
             link_preview_options=LinkPreviewOptions(is_disabled=True)
         )
@@ -283,17 +284,15 @@ async def edit_weekly_schedule_for_date(
         return
 
     try:
-        schedule_dto = await schedule_service.get_schedule_for_week(telegram_id, target_date)
-        response_text = schedule_service.format_weekly_schedule_message(schedule_dto)
-        current_week_start_date = date.fromisoformat(schedule_dto.week_start_date)
+        rendered = await schedule_service.get_rendered_schedule_for_week(telegram_id, target_date)
         keyboard = create_weekly_schedule_navigation_keyboard(
-            current_week_start_date, 
+            rendered.schedule_date,
             original_user_id=telegram_id,
             semester_start=semester_start,
             semester_end=semester_end
         )
         await message.edit_text(
-            response_text, 
+            rendered.text,
             reply_markup=keyboard,
             link_preview_options=LinkPreviewOptions(is_disabled=True)
         )
@@ -316,17 +315,15 @@ async def edit_inline_schedule_for_date(
 ):
     """Редагує існуюче інлайн-повідомлення з денним розкладом."""
     try:
-        schedule_dto = await schedule_service.get_schedule_for_day(telegram_id, target_date)
-        response_text = schedule_service.format_schedule_message(schedule_dto)
-        current_schedule_date = date.fromisoformat(schedule_dto.date)
+        rendered = await schedule_service.get_rendered_schedule_for_day(telegram_id, target_date)
         keyboard = create_schedule_navigation_keyboard(
-            current_schedule_date, 
+            rendered.schedule_date,
             original_user_id=telegram_id,
             semester_start=semester_start,
             semester_end=semester_end
         )
         await bot.edit_message_text(
-            text=response_text,
+            text=rendered.text,
             inline_message_id=inline_message_id,
             reply_markup=keyboard,
             link_preview_options=LinkPreviewOptions(is_disabled=True)
@@ -349,17 +346,15 @@ async def edit_inline_weekly_schedule_for_date(
 ):
     """Редагує існуюче інлайн-повідомлення з тижневим розкладом."""
     try:
-        schedule_dto = await schedule_service.get_schedule_for_week(telegram_id, target_date)
-        response_text = schedule_service.format_weekly_schedule_message(schedule_dto)
-        current_week_start_date = date.fromisoformat(schedule_dto.week_start_date)
+        rendered = await schedule_service.get_rendered_schedule_for_week(telegram_id, target_date)
         keyboard = create_weekly_schedule_navigation_keyboard(
-            current_week_start_date, 
+            rendered.schedule_date,
             original_user_id=telegram_id,
             semester_start=semester_start,
             semester_end=semester_end
         )
         await bot.edit_message_text(
-            text=response_text,
+            text=rendered.text,
             inline_message_id=inline_message_id,
             reply_markup=keyboard,
             link_preview_options=LinkPreviewOptions(is_disabled=True)
@@ -1,4 +1,5 @@
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from datetime import date
 from datetime import timedelta
 
@@ -35,8 +36,7 @@ class SubjectCallbackFactory(CallbackData, prefix="subject"):
     action: str
     subject_name_id: int | None = None
 
-def create_main_keyboard(is_admin: bool = False) -> ReplyKeyboardMarkup:
-    """Створює головну клавіатуру з основними діями."""
+def _build_main_keyboard(is_admin: bool) -> ReplyKeyboardMarkup:
     keyboard_layout = [
         [
             KeyboardButton(text="🗓 Отримати розклад"),
@@ -59,13 +59,44 @@ def create_main_keyboard(is_admin: bool = False) -> ReplyKeyboardMarkup:
         one_time_keyboard=False
     )
 
-def create_admin_panel_keyboard() -> InlineKeyboardMarkup:
-    """Створює інлайн-клавіатуру для адмін-панелі."""
-    buttons = [
-        [InlineKeyboardButton(text="✉️ Створити розсилку", callback_data="start_broadcast")],
-        [InlineKeyboardButton(text="Закрити ❌", callback_data="close_admin_panel")]
+# Статичні клавіатури не залежать від користувача, тож створюються один раз і лише серіалізуються.
+_MAIN_KEYBOARD = _build_main_keyboard(is_admin=False)
+_ADMIN_MAIN_KEYBOARD = _build_main_keyboard(is_admin=True)
+
+_ADMIN_PANEL_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="✉️ Створити розсилку", callback_data="start_broadcast")],
+    [InlineKeyboardButton(text="🚷 Недоступні отримувачі (CSV)", callback_data="export_unreachable_recipients")],
+    [InlineKeyboardButton(text="Закрити ❌", callback_data="close_admin_panel")]
+])
+
+_SETTINGS_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(
+            text="Змінити групу",
+            callback_data=SettingsCallbackFactory(action="change_group").pack()
+        )
+    ],
+    [
+        InlineKeyboardButton(
+            text="Змінити часовий пояс",
+            callback_data=SettingsCallbackFactory(action="change_region").pack()
+        )
+    ],
+    [
+        InlineKeyboardButton(
+            text="Закрити ❌",
+            callback_data=SettingsCallbackFactory(action="close").pack()
+        )
     ]
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
+])
+
+def create_main_keyboard(is_admin: bool = False) -> ReplyKeyboardMarkup:
+    """Повертає головну клавіатуру з основними діями."""
+    return _ADMIN_MAIN_KEYBOARD if is_admin else _MAIN_KEYBOARD
+
+def create_admin_panel_keyboard() -> InlineKeyboardMarkup:
+    """Повертає інлайн-клавіатуру для адмін-панелі."""
+    return _ADMIN_PANEL_KEYBOARD
 
 def create_broadcast_type_keyboard() -> InlineKeyboardMarkup:
     """Створює клавіатуру для вибору типу розсилки."""
@@ -98,28 +129,73 @@ def create_cancel_fsm_keyboard() -> InlineKeyboardMarkup:
     ]])
 
 def create_settings_keyboard() -> InlineKeyboardMarkup:
-    """Створює інлайн-клавіатуру для меню налаштувань."""
-    buttons = [
-        [
-            InlineKeyboardButton(
-                text="Змінити групу",
-                callback_data=SettingsCallbackFactory(action="change_group").pack()
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text="Змінити часовий пояс",
-                callback_data=SettingsCallbackFactory(action="change_region").pack()
-            )
-        ],
+    """Повертає інлайн-клавіатуру для меню налаштувань."""
+    return _SETTINGS_KEYBOARD
+
+
+# Кнопки навігації для кожного виду розкладу: (текст, дія) для кнопок "назад" і "вперед".
+_NAVIGATION_BUTTONS: Dict[str, Tuple[Tuple[str, str], Tuple[str, str]]] = {
+    'day': (("⬅️", "prev"), ("➡️", "next")),
+    'week': (("⬅️ Попер. тиждень", "prev_week"), ("Наст. тиждень ➡️", "next_week")),
+}
+
+# Рядки кнопок клавіатури: (текст, шаблон callback data з місцями для дати та користувача).
+NavigationSkeleton = Tuple[Tuple[Tuple[str, str], ...], ...]
+
+
+def _schedule_callback_template(action: str, schedule_type: str) -> str:
+    """
+    Шаблон упакованого ScheduleCallbackFactory з незмінними полями, у який лишається підставити
+    current_date та original_user_id (поля йдуть у порядку оголошення, як у CallbackData.pack).
+    """
+    return ScheduleCallbackFactory.__separator__.join(
+        (ScheduleCallbackFactory.__prefix__, action, schedule_type, "{}", "{}")
+    )
+
+
+def _build_navigation_skeleton(schedule_type: str, has_prev: bool, has_next: bool) -> NavigationSkeleton:
+    (prev_text, prev_action), (next_text, next_action) = _NAVIGATION_BUTTONS[schedule_type]
+    navigation_row = []
+    if has_prev:
+        navigation_row.append((prev_text, _schedule_callback_template(prev_action, schedule_type)))
+    if has_next:
+        navigation_row.append((next_text, _schedule_callback_template(next_action, schedule_type)))
+
+    rows = [tuple(navigation_row)] if navigation_row else []
+    rows.append((("Закрити ❌", _schedule_callback_template("close", schedule_type)),))
+    return tuple(rows)
+
+
+_NAVIGATION_SKELETONS: Dict[Tuple[str, bool, bool], NavigationSkeleton] = {
+    (schedule_type, has_prev, has_next): _build_navigation_skeleton(schedule_type, has_prev, has_next)
+    for schedule_type in _NAVIGATION_BUTTONS
+    for has_prev in (False, True)
+    for has_next in (False, True)
+}
+
+
+# Готові клавіатури не змінюються після створення, тож повторні покази того ж дня
+# (інлайн-запити, повернення назад) отримують уже створений об'єкт.
+NAVIGATION_KEYBOARD_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=NAVIGATION_KEYBOARD_CACHE_SIZE)
+def _render_navigation_keyboard(
+    schedule_type: str,
+    has_prev: bool,
+    has_next: bool,
+    current_date: date,
+    original_user_id: int
+) -> InlineKeyboardMarkup:
+    """Заповнює готовий шаблон клавіатури датою та користувачем без повторного ScheduleCallbackFactory.pack()."""
+    date_str = current_date.isoformat()
+    return InlineKeyboardMarkup(inline_keyboard=[
         [
-             InlineKeyboardButton(
-                text="Закрити ❌",
-                callback_data=SettingsCallbackFactory(action="close").pack()
-            )
+            InlineKeyboardButton(text=text, callback_data=template.format(date_str, original_user_id))
+            for text, template in row
         ]
-    ]
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
+        for row in _NAVIGATION_SKELETONS[(schedule_type, has_prev, has_next)]
+    ])
 
 
 def create_schedule_navigation_keyboard(
@@ -129,49 +205,13 @@ def create_schedule_navigation_keyboard(
     semester_end: date | None = None
 ) -> InlineKeyboardMarkup:
     """Створює інлайн-клавіатуру для навігації по днях розкладу."""
-    date_str = current_date.isoformat()
-    
-    navigation_buttons = []
-
-    if semester_start is None or current_date > semester_start:
-        navigation_buttons.append(
-            InlineKeyboardButton(
-                text="⬅️",
-                callback_data=ScheduleCallbackFactory(
-                    action="prev", schedule_type="day",
-                    current_date=date_str, 
-                    original_user_id=original_user_id
-                ).pack()
-            )
-        )
-
-    if semester_end is None or current_date < semester_end:
-        navigation_buttons.append(
-            InlineKeyboardButton(
-                text="➡️",
-                callback_data=ScheduleCallbackFactory(
-                    action="next", schedule_type="day",
-                    current_date=date_str, 
-                    original_user_id=original_user_id
-                ).pack()
-            )
-        )
-    
-    close_button = InlineKeyboardButton(
-        text="Закрити ❌",
-        callback_data=ScheduleCallbackFactory(
-            action="close", schedule_type="day",
-            current_date=date_str,
-            original_user_id=original_user_id
-        ).pack()
+    return _render_navigation_keyboard(
+        'day',
+        has_prev=semester_start is None or current_date > semester_start,
+        has_next=semester_end is None or current_date < semester_end,
+        current_date=current_date,
+        original_user_id=original_user_id
     )
-    
-    keyboard = []
-    if navigation_buttons:
-        keyboard.append(navigation_buttons)
-    keyboard.append([close_button])
-    
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 def create_weekly_schedule_navigation_keyboard(
     current_date: date, 
@@ -180,51 +220,13 @@ def create_weekly_schedule_navigation_keyboard(
     semester_end: date | None = None
 ) -> InlineKeyboardMarkup:
     """Створює інлайн-клавіатуру для навігації по тижнях розкладу."""
-    date_str = current_date.isoformat()
-    
-    navigation_buttons = []
-    
-    prev_week_date = current_date - timedelta(days=7)
-    if semester_start is None or prev_week_date >= semester_start:
-        navigation_buttons.append(
-            InlineKeyboardButton(
-                text="⬅️ Попер. тиждень",
-                callback_data=ScheduleCallbackFactory(
-                    action="prev_week", schedule_type="week",
-                    current_date=date_str, 
-                    original_user_id=original_user_id
-                ).pack()
-            )
-        )
-
-    next_week_date = current_date + timedelta(days=7)
-    if semester_end is None or next_week_date <= semester_end:
-        navigation_buttons.append(
-            InlineKeyboardButton(
-                text="Наст. тиждень ➡️",
-                callback_data=ScheduleCallbackFactory(
-                    action="next_week", schedule_type="week",
-                    current_date=date_str, 
-                    original_user_id=original_user_id
-                ).pack()
-            )
-        )
-    
-    close_button = InlineKeyboardButton(
-        text="Закрити ❌",
-        callback_data=ScheduleCallbackFactory(
-            action="close", schedule_type="week",
-            current_date=date_str,
-            original_user_id=original_user_id
-        ).pack()
+    return _render_navigation_keyboard(
+        'week',
+        has_prev=semester_start is None or current_date - timedelta(days=7) >= semester_start,
+        has_next=semester_end is None or current_date + timedelta(days=7) <= semester_end,
+        current_date=current_date,
+        original_user_id=original_user_id
     )
-    
-    keyboard = []
-    if navigation_buttons:
-        keyboard.append(navigation_buttons)
-    keyboard.append([close_button])
-    
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 def create_show_schedule_keyboard(original_user_id: int) -> InlineKeyboardMarkup:
     """Створює клавіатуру з кнопкою для показу розкладу на сьогодні."""
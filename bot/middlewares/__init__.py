@@ -1,3 +1,5 @@
 from .di import DiMiddleware
+from .scheduler import UpdateSchedulerMiddleware
+from .throttling import NavigationCoalescingMiddleware, ThrottlingMiddleware
 
-__all__ = ['DiMiddleware']
\ No newline at end of file
+__all__ = ['DiMiddleware', 'NavigationCoalescingMiddleware', 'ThrottlingMiddleware', 'UpdateSchedulerMiddleware']
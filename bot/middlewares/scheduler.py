@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import Chat, TelegramObject, Update, User
+
+logger = logging.getLogger(__name__)
+
+BUSY_TEXT = "⏳ Бот зараз перевантажений, спробуйте ще раз за мить."
+
+
+class _KeyLock:
+    """Замок для одного користувача з лічильником очікувачів, щоб прибирати його, коли він не потрібен."""
+    __slots__ = ('lock', 'users')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class UpdateSchedulerMiddleware(BaseMiddleware):
+    """
+    Планувальник обробки оновлень (outer middleware на рівні update):
+    - не більше max_concurrency оновлень обробляються одночасно, решта чекають у черзі;
+    - оновлення одного користувача (або чату) обробляються строго по черзі, у порядку надходження;
+    - якщо в черзі вже max_pending оновлень, натискання кнопок одразу отримують відповідь "зайнято",
+      а інлайн-запити відкидаються, замість того щоб чекати і завершитися тайм-аутом.
+    """
+    def __init__(self, max_concurrency: int, max_pending: int):
+        super().__init__()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_concurrency = max_concurrency
+        self._max_pending = max_pending
+        self._locks: Dict[Hashable, _KeyLock] = {}
+        self._waiting = 0
+        self._in_flight = 0
+        self._max_waiting = 0
+        self._processed = 0
+        self._shed = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        if self._waiting >= self._max_pending and (event.callback_query or event.inline_query):
+            await self._shed_update(event, data['bot'])
+            return None
+
+        key = self._key(data)
+        key_lock = self._locks.get(key)
+        if key_lock is None:
+            key_lock = self._locks[key] = _KeyLock()
+        key_lock.users += 1
+
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        waiting = True
+        try:
+            async with key_lock.lock, self._semaphore:
+                self._waiting -= 1
+                waiting = False
+                self._in_flight += 1
+                try:
+                    return await handler(event, data)
+                finally:
+                    self._in_flight -= 1
+                    self._processed += 1
+        finally:
+            if waiting:
+                self._waiting -= 1
+            key_lock.users -= 1
+            if key_lock.users == 0:
+                del self._locks[key]
+
+    @staticmethod
+    def _key(data: Dict[str, Any]) -> Hashable:
+        user: User | None = data.get('event_from_user')
+        if user is not None:
+            return 'user', user.id
+        chat: Chat | None = data.get('event_chat')
+        if chat is not None:
+            return 'chat', chat.id
+        # Оновлення без користувача і чату не впорядковуються між собою.
+        return 'update', id(data)
+
+    async def _shed_update(self, update: Update, bot: Bot) -> None:
+        self._shed += 1
+        if self._shed == 1 or self._shed % 100 == 0:
+            logger.warning("Update queue is full (%d waiting), shedding load: %d updates rejected so far",
+                           self._waiting, self._shed)
+
+        if update.callback_query:
+            try:
+                await bot.answer_callback_query(update.callback_query.id, text=BUSY_TEXT)
+            except TelegramAPIError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Повертає метрики черги: оброблені, відхилені, поточна та максимальна глибина черги."""
+        return {
+            'max_concurrency': self._max_concurrency,
+            'in_flight': self._in_flight,
+            'waiting': self._waiting,
+            'max_waiting': self._max_waiting,
+            'active_keys': len(self._locks),
+            'processed': self._processed,
+            'shed': self._shed,
+        }
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from itertools import count
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, TelegramObject, Update
+
+from application.cache import TTLCache
+from bot.keyboards import ScheduleCallbackFactory
+
+logger = logging.getLogger(__name__)
+
+NAVIGATION_ACTIONS = frozenset({"prev", "next", "prev_week", "next_week"})
+
+# Ліміти на користувача для кожної категорії оновлень: (токенів за секунду, розмір сплеску).
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    'message': (1.0, 5),
+    'callback': (2.0, 6),
+    'navigation': (3.0, 10),
+    'inline': (1.0, 5),
+}
+THROTTLED_TEXT = "⏳ Не так швидко, зачекайте секунду."
+# Скільки пам'ятати останнє натискання навігації для повідомлення.
+NAVIGATION_TRACKING_SECONDS = 60
+MAX_TRACKED_USERS = 50_000
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Обмеження частоти оновлень від одного користувача (outer middleware на рівні update,
+    реєструється перед UpdateSchedulerMiddleware, тож відкинуті оновлення не займають місця в черзі).
+    - Для кожної категорії (повідомлення, кнопки, навігація по розкладу, інлайн-запити) — окремий token bucket.
+    - Інлайн-запити обробляються лише після паузи inline_debounce_seconds, якщо користувач
+      не надрукував за цей час нічого нового.
+    - Кожне натискання навігації по розкладу отримує номер; NavigationCoalescingMiddleware відкидає
+      натискання, для яких на тому ж повідомленні вже є новіше.
+    """
+    def __init__(self, inline_debounce_seconds: float, limits: Dict[str, Tuple[float, float]] | None = None):
+        super().__init__()
+        self._limits = limits or DEFAULT_LIMITS
+        self._inline_debounce = inline_debounce_seconds
+        # Запис зникає, коли bucket встиг би наповнитися повністю, тож окреме прибирання не потрібне.
+        self._buckets: TTLCache[Tuple[int, str], List[float]] = TTLCache(
+            max_size=MAX_TRACKED_USERS, default_ttl=0, name="throttling_buckets"
+        )
+        self._latest_navigation: TTLCache[Hashable, int] = TTLCache(
+            max_size=MAX_TRACKED_USERS, default_ttl=NAVIGATION_TRACKING_SECONDS, name="navigation_taps"
+        )
+        self._latest_inline: TTLCache[int, int] = TTLCache(
+            max_size=MAX_TRACKED_USERS, default_ttl=NAVIGATION_TRACKING_SECONDS, name="inline_queries"
+        )
+        # Користувачі, яким уже відповіли "не так швидко": одна відповідь, доки не з'явиться новий токен.
+        self._warned: TTLCache[int, bool] = TTLCache(
+            max_size=MAX_TRACKED_USERS, default_ttl=1 / self._limits['message'][0], name="throttling_warnings"
+        )
+        self._sequence = count(1)
+        self._throttled = 0
+        self._debounced = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        if event.inline_query:
+            user_id = event.inline_query.from_user.id
+            sequence = next(self._sequence)
+            self._latest_inline.set(user_id, sequence)
+            await asyncio.sleep(self._inline_debounce)
+            if self._latest_inline.get(user_id) != sequence:
+                self._debounced += 1
+                return None
+            if not self._try_acquire(user_id, 'inline'):
+                self._throttled += 1
+                return None
+            return await handler(event, data)
+
+        if event.callback_query:
+            query = event.callback_query
+            navigation_key = self._navigation_key(query)
+            category = 'navigation' if navigation_key is not None else 'callback'
+            if not self._try_acquire(query.from_user.id, category):
+                self._throttled += 1
+                await self._answer(data['bot'], query, THROTTLED_TEXT)
+                return None
+            if navigation_key is not None:
+                sequence = next(self._sequence)
+                self._latest_navigation.set(navigation_key, sequence)
+                data['navigation_tap'] = (navigation_key, sequence)
+            return await handler(event, data)
+
+        if event.message and event.message.from_user:
+            user_id = event.message.from_user.id
+            if not self._try_acquire(user_id, 'message'):
+                self._throttled += 1
+                logger.debug("Dropping message from user %d: rate limit exceeded", user_id)
+                if user_id not in self._warned:
+                    self._warned.set(user_id, True)
+                    await self._warn(data['bot'], event.message.chat.id)
+                return None
+
+        return await handler(event, data)
+
+    def _try_acquire(self, user_id: int, category: str) -> bool:
+        rate, capacity = self._limits[category]
+        now = monotonic()
+        key = (user_id, category)
+        bucket = self._buckets.get(key)
+        tokens = capacity if bucket is None else min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        if tokens < 1:
+            return False
+        tokens -= 1
+        self._buckets.set(key, [tokens, now], ttl=(capacity - tokens) / rate)
+        return True
+
+    @staticmethod
+    def _navigation_key(query: CallbackQuery) -> Hashable | None:
+        """Ключ повідомлення, яке гортає користувач, або None, якщо це не навігація по розкладу."""
+        if not query.data or not query.data.startswith(f"{ScheduleCallbackFactory.__prefix__}:"):
+            return None
+        try:
+            callback_data = ScheduleCallbackFactory.unpack(query.data)
+        except (TypeError, ValueError):
+            return None
+        if callback_data.action not in NAVIGATION_ACTIONS:
+            return None
+
+        if query.inline_message_id:
+            return 'inline', query.inline_message_id
+        if query.message:
+            return 'message', query.message.chat.id, query.message.message_id
+        return None
+
+    def is_superseded(self, navigation_key: Hashable, sequence: int) -> bool:
+        """Чи натиснув користувач навігацію на тому ж повідомленні ще раз після цього натискання."""
+        latest = self._latest_navigation.get(navigation_key)
+        return latest is not None and latest != sequence
+
+    @staticmethod
+    async def _answer(bot: Bot, query: CallbackQuery, text: str | None = None) -> None:
+        try:
+            await bot.answer_callback_query(query.id, text=text)
+        except TelegramAPIError:
+            pass
+
+    @staticmethod
+    async def _warn(bot: Bot, chat_id: int) -> None:
+        try:
+            await bot.send_message(chat_id, THROTTLED_TEXT)
+        except TelegramAPIError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'throttled': self._throttled,
+            'debounced_inline': self._debounced,
+            'tracked_buckets': len(self._buckets),
+        }
+
+
+class NavigationCoalescingMiddleware(BaseMiddleware):
+    """
+    Пропускає застарілі натискання навігації по розкладу (outer middleware на рівні update,
+    реєструється після UpdateSchedulerMiddleware, тобто перевірка виконується, коли настала черга оновлення).
+    Якщо користувач встиг натиснути ⬅️/➡️ ще раз, відмальовується лише останнє натискання.
+    """
+    def __init__(self, throttling: ThrottlingMiddleware):
+        super().__init__()
+        self._throttling = throttling
+        self._coalesced = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        navigation_tap = data.get('navigation_tap')
+        if (
+            isinstance(event, Update) and event.callback_query and navigation_tap is not None
+            and self._throttling.is_superseded(*navigation_tap)
+        ):
+            self._coalesced += 1
+            await ThrottlingMiddleware._answer(data['bot'], event.callback_query)
+            return None
+        return await handler(event, data)
+
+    def stats(self) -> Dict[str, int]:
+        return {'coalesced': self._coalesced}
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import signal
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PATH = '/health'
+
+
+async def _health(_: web.Request) -> web.Response:
+    return web.Response(text="ok")
+
+
+async def run_webhook(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    base_url: str,
+    path: str,
+    secret_token: str,
+    host: str,
+    port: int
+) -> None:
+    """
+    Приймає оновлення через вебхук на вбудованому aiohttp-сервері, доки процес не отримає SIGINT/SIGTERM.
+    Telegram отримує відповідь одразу, а оновлення обробляються паралельно у фонових задачах.
+    Кілька реплік можуть працювати за балансувальником з однаковим base_url: кожна при старті
+    встановлює той самий вебхук і не видаляє його при зупинці.
+    """
+    app = web.Application()
+    app.router.add_get(HEALTH_PATH, _health)
+
+    async def set_webhook() -> None:
+        await bot.set_webhook(
+            url=base_url.rstrip('/') + path,
+            secret_token=secret_token,
+            allowed_updates=dispatcher.resolve_used_update_types()
+        )
+        logger.info("Webhook set to %s%s", base_url.rstrip('/'), path)
+
+    dispatcher.startup.register(set_webhook)
+
+    # setup_application реєструється першим, тож обробники shutdown виконуються до закриття сесії бота.
+    setup_application(app, dispatcher, bot=bot)
+    SimpleRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        secret_token=secret_token,
+        handle_in_background=True
+    ).register(app, path=path)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host=host, port=port).start()
+        logger.info("Listening for webhook updates on %s:%d%s", host, port, path)
+        await stop_event.wait()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+
+from api import ApiClient
+from api.gateways import BroadcastGateway
+from application.broadcasting import BroadcastStats, RecipientHealthStore
+from application.broadcasting.workers import PROGRESS_INTERVAL_SECONDS
+from application.services import BroadcastService
+from config import settings
+
+EXIT_BROADCAST_CHANGED = 3
+
+
+def report_progress(shard: int, stats: BroadcastStats, done: bool = False) -> None:
+    """Пише звіт про прогрес у stdout одним рядком JSON — його читає головний процес бота."""
+    report = {
+        'shard': shard,
+        'done': done,
+        'counters': stats.counters(),
+        'total': stats.total,
+        'paused_for': round(stats.paused_for, 1),
+    }
+    print(json.dumps(report), flush=True)
+
+
+async def report_periodically(shard: int, stats: BroadcastStats) -> None:
+    while True:
+        await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+        report_progress(shard, stats)
+
+
+async def main(broadcast_id: int, shard: int, shard_count: int) -> int:
+    # stdout зайнятий звітами про прогрес, тому логи йдуть у stderr.
+    logging.basicConfig(
+        level=logging.INFO,
+        stream=sys.stderr,
+        format=f'%(asctime)s - worker[{shard}/{shard_count}] - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    current_task = asyncio.current_task()
+    if current_task is not None:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, current_task.cancel)
+
+    stats = BroadcastStats()
+    stats.broadcast_id = broadcast_id
+
+    api_client_obj = ApiClient(base_url=settings.api_base_url, api_key=settings.api_key, use_ssl=False)
+    async with api_client_obj as api_client:
+        recipient_health = (
+            RecipientHealthStore(settings.broadcast_unreachable_path).load()
+            if settings.broadcast_unreachable_path else None
+        )
+        broadcast_service = BroadcastService(
+            gateway=BroadcastGateway(client=api_client),
+            recipient_health=recipient_health
+        )
+        bot = Bot(
+            token=settings.telegram_bot_token,
+            default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+        )
+        reporter = asyncio.create_task(report_periodically(shard, stats))
+        try:
+            sent = await broadcast_service.run_broadcast_shard(bot, broadcast_id, shard, shard_count, stats)
+        finally:
+            reporter.cancel()
+            await bot.session.close()
+
+    report_progress(shard, stats, done=True)
+    return 0 if sent else EXIT_BROADCAST_CHANGED
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sends one shard of a pending broadcast.")
+    parser.add_argument('--broadcast-id', type=int, required=True)
+    parser.add_argument('--shard', type=int, required=True)
+    parser.add_argument('--shards', type=int, required=True)
+    args = parser.parse_args()
+
+    try:
+        sys.exit(asyncio.run(main(args.broadcast_id, args.shard, args.shards)))
+    except asyncio.CancelledError:
+        logging.warning("Broadcast worker stopped, progress is kept in the journal.")
+        sys.exit(1)
@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,4 +13,75 @@ class Settings(BaseSettings):
     api_key: str
     admin_api_key: str
 
+    # Спосіб отримання оновлень: long polling або вебхук на вбудованому aiohttp-сервері.
+    bot_mode: Literal['polling', 'webhook'] = 'polling'
+    # Публічна адреса, за якою Telegram надсилає оновлення (наприклад, https://bot.example.com).
+    webhook_base_url: str | None = None
+    webhook_path: str = "/webhook"
+    # Секрет, який Telegram передає в заголовку X-Telegram-Bot-Api-Secret-Token (1-256 символів A-Z, a-z, 0-9, _ та -).
+    webhook_secret: str | None = None
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+
+    # Redis (або сумісний сервер) для стану FSM та спільного кешу розкладу між репліками.
+    # Без нього стан і кеші зберігаються в пам'яті процесу, тож можна запускати лише одну репліку.
+    redis_url: str | None = None
+    redis_key_prefix: str = "schedulebot:"
+    # Скільки живе незавершений діалог (реєстрація, налаштування, розсилка) у Redis.
+    fsm_state_ttl_seconds: int = 86400
+
+    # Обробка оновлень: скільки оновлень обробляється одночасно та скільки може чекати в черзі,
+    # перш ніж натискання кнопок почнуть отримувати відповідь "зайнято".
+    update_max_concurrency: int = 64
+    update_max_pending: int = 500
+    # Обмеження частоти запитів від одного користувача та пауза перед обробкою інлайн-запиту,
+    # щоб не шукати розклад на кожну надруковану літеру.
+    throttling_enabled: bool = True
+    inline_debounce_seconds: float = 0.4
+
+    # Кеш довідкових даних (групи, регіони, семестри, викладачі, предмети).
+    reference_cache_ttl_seconds: int = 3600
+    # Скільки секунд після закінчення TTL можна віддавати застарілі дані, поки вони оновлюються у фоні.
+    reference_cache_max_staleness_seconds: int = 86400
+
+    # Прогрів кешів перед початком обробки оновлень.
+    warmup_enabled: bool = True
+    warmup_preload_schedules: bool = False
+    # Часовий пояс, для якого прогрівається розклад; за замовчуванням — пояс більшості регіонів.
+    warmup_schedule_time_zone_id: str | None = None
+    warmup_deadline_seconds: float = 30
+
+    # Знімок кешів на диску для "теплого" перезапуску. Порожнє значення вимикає знімки.
+    cache_snapshot_path: str | None = None
+    cache_snapshot_interval_seconds: int = 300
+
+    # Як часто записувати в лог метрики (влучання кешів тощо). 0 вимикає періодичний запис.
+    metrics_log_interval_seconds: float = 300
+
+    # Розсилки: глобальна швидкість (ліміт Telegram ~30 повідомлень/с) та кількість паралельних відправок.
+    broadcast_rate_per_second: float = 28
+    broadcast_concurrency: int = 20
+    # Каталог журналів доставки, що дозволяють продовжити перервану розсилку без повторних відправок.
+    broadcast_journal_dir: str = "data/broadcasts"
+    # Файл обліку недоступних отримувачів (заблокували бота тощо), яких наступні розсилки пропускають.
+    # Порожнє значення вимикає облік.
+    broadcast_unreachable_path: str | None = "data/broadcasts/unreachable_recipients.jsonl"
+    # Кількість окремих процесів для розсилки (broadcast_worker.py); 1 — розсилка в процесі бота.
+    broadcast_worker_count: int = 1
+    # Як часто оновлювати повідомлення з прогресом розсилки в адмін-панелі.
+    broadcast_progress_interval_seconds: float = 3
+    # Фоновий диспетчер, що опитує API на заплановані розсилки, час яких настав.
+    # Кілька реплік не дублюють розсилку лише з REDIS_URL (оренда в Redis); без нього вмикайте на одній репліці.
+    broadcast_dispatcher_enabled: bool = True
+    broadcast_poll_min_interval_seconds: float = 15
+    broadcast_poll_max_interval_seconds: float = 300
+    # Скільки секунд при зупинці бота чекати завершення поточної розсилки (далі — продовження після перезапуску).
+    broadcast_shutdown_drain_seconds: float = 10
+
+    @model_validator(mode='after')
+    def check_webhook_settings(self) -> 'Settings':
+        if self.bot_mode == 'webhook' and not (self.webhook_base_url and self.webhook_secret):
+            raise ValueError("WEBHOOK_BASE_URL and WEBHOOK_SECRET are required when BOT_MODE=webhook")
+        return self
+
 settings = Settings() # type: ignore
\ No newline at end of file
@@ -5,7 +5,10 @@ import sys
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+from redis.asyncio import Redis
 
 from api import ApiClient
 from api.gateways import (GroupGateway, RegionGateway, ScheduleGateway,
@@ -14,8 +17,15 @@ from api.gateways import (GroupGateway, RegionGateway, ScheduleGateway,
 from application.services import (GroupService, RegionService, ScheduleService,
                                   UserService, TeacherService, SubjectService,
                                   SemesterService, BroadcastService)
+from application.broadcasting import BroadcastDispatcher, BroadcastLease, RecipientHealthStore
+from application.metrics import MetricsReporter, collect_cache_stats
+from application.shared_cache import RedisSharedCache, SharedCacheBackend
+from application.snapshot import CacheSnapshotStore, collect_snapshot_sections
+from application.warmup import warm_up_caches
 from bot import handlers
-from bot.middlewares import DiMiddleware
+from bot.middlewares import (DiMiddleware, NavigationCoalescingMiddleware,
+                             ThrottlingMiddleware, UpdateSchedulerMiddleware)
+from bot.webhook import run_webhook
 from config import settings
 
 
@@ -31,6 +41,24 @@ async def main():
 
     api_client_obj = ApiClient(base_url=settings.api_base_url, api_key=settings.api_key, use_ssl=False)
 
+    # --- Shared State ---
+    # З Redis стан FSM і кеш розкладу спільні для всіх реплік; без нього — у пам'яті процесу.
+    storage: BaseStorage
+    shared_cache: SharedCacheBackend | None = None
+    broadcast_lease: BroadcastLease | None = None
+    if settings.redis_url:
+        redis = Redis.from_url(settings.redis_url)
+        storage = RedisStorage(
+            redis,
+            key_builder=DefaultKeyBuilder(prefix=f"{settings.redis_key_prefix}fsm"),
+            state_ttl=settings.fsm_state_ttl_seconds,
+            data_ttl=settings.fsm_state_ttl_seconds
+        )
+        shared_cache = RedisSharedCache(redis, prefix=settings.redis_key_prefix)
+        broadcast_lease = BroadcastLease(redis, key=f"{settings.redis_key_prefix}broadcast:lease")
+    else:
+        storage = MemoryStorage()
+
     async with api_client_obj as api_client:
         user_gateway = UserGateway(client=api_client)
         group_gateway = GroupGateway(client=api_client)
@@ -47,16 +75,22 @@ async def main():
         teacher_service = TeacherService(gateway=teacher_gateway)
         semester_service = SemesterService(gateway=semester_gateway)
         subject_service = SubjectService(gateway=subject_gateway, teacher_service=teacher_service)
-        broadcast_service = BroadcastService(gateway=broadcast_gateway)
+        recipient_health = (
+            RecipientHealthStore(settings.broadcast_unreachable_path).load()
+            if settings.broadcast_unreachable_path else None
+        )
+        broadcast_service = BroadcastService(
+            gateway=broadcast_gateway, recipient_health=recipient_health, run_lease=broadcast_lease
+        )
 
         schedule_service = ScheduleService(
             schedule_gateway=schedule_gateway,
             user_service=user_service,
-            region_service=region_service
+            region_service=region_service,
+            shared_cache=shared_cache
         )
 
         # --- Bot Initialization ---
-        storage = MemoryStorage()
         bot = Bot(
             token=settings.telegram_bot_token,
             default=DefaultBotProperties(parse_mode=ParseMode.HTML)
@@ -64,6 +98,18 @@ async def main():
         dispatcher = Dispatcher(storage=storage)
 
         # --- Middleware Registration ---
+        # Порядок важливий: обмеження частоти -> черга оновлень -> пропуск застарілої навігації.
+        throttling = ThrottlingMiddleware(inline_debounce_seconds=settings.inline_debounce_seconds)
+        if settings.throttling_enabled:
+            dispatcher.update.outer_middleware(throttling)
+        update_scheduler = UpdateSchedulerMiddleware(
+            max_concurrency=settings.update_max_concurrency,
+            max_pending=settings.update_max_pending
+        )
+        dispatcher.update.outer_middleware(update_scheduler)
+        navigation_coalescing = NavigationCoalescingMiddleware(throttling)
+        if settings.throttling_enabled:
+            dispatcher.update.outer_middleware(navigation_coalescing)
         dispatcher.update.middleware(
             DiMiddleware(
                 user_service=user_service,
@@ -88,10 +134,109 @@ async def main():
         dispatcher.include_router(handlers.subject_router)
         dispatcher.include_router(handlers.admin_router)
 
+        # --- Cache Snapshot ---
+        snapshot_store: CacheSnapshotStore | None = None
+        if settings.cache_snapshot_path:
+            snapshot_store = CacheSnapshotStore(
+                path=settings.cache_snapshot_path,
+                sections=collect_snapshot_sections(
+                    group_service, region_service, semester_service,
+                    teacher_service, subject_service, schedule_service
+                )
+            )
+            restored = snapshot_store.load()
+            logging.info("Restored %d cache entries from %s", restored, settings.cache_snapshot_path)
+
+        # --- Metrics ---
+        metrics = MetricsReporter(collect_cache_stats(
+            group_service, region_service, semester_service, teacher_service,
+            subject_service, user_service, schedule_service
+        ))
+        metrics.add_source('api_coalescing', api_client.get_coalescing_stats)
+        metrics.add_source('update_scheduler', update_scheduler.stats)
+        if settings.throttling_enabled:
+            metrics.add_source('throttling', throttling.stats)
+            metrics.add_source('navigation_coalescing', navigation_coalescing.stats)
+
+        # --- Cache Warm-up ---
+        if settings.warmup_enabled:
+            logging.info("Warming up caches...")
+            await warm_up_caches(
+                group_service=group_service,
+                region_service=region_service,
+                semester_service=semester_service,
+                teacher_service=teacher_service,
+                subject_service=subject_service,
+                schedule_service=schedule_service,
+                preload_schedules=settings.warmup_preload_schedules,
+                deadline_seconds=settings.warmup_deadline_seconds,
+                schedule_time_zone_id=settings.warmup_schedule_time_zone_id
+            )
+
+        # --- Broadcast Dispatcher ---
+        # Запускається та зупиняється разом з отриманням оновлень, до закриття сесії бота.
+        # При кількох репліках (вебхук) розсилку одночасно виконує лише та, що взяла оренду в Redis;
+        # без REDIS_URL диспетчер має бути ввімкнений лише на одній з них.
+        if settings.broadcast_dispatcher_enabled:
+            broadcast_dispatcher = BroadcastDispatcher(
+                broadcast_service=broadcast_service,
+                bot=bot,
+                min_poll_interval=settings.broadcast_poll_min_interval_seconds,
+                max_poll_interval=settings.broadcast_poll_max_interval_seconds
+            )
+
+            async def start_broadcast_dispatcher() -> None:
+                broadcast_dispatcher.start()
+
+            async def stop_broadcast_dispatcher() -> None:
+                await broadcast_dispatcher.stop(drain_timeout=settings.broadcast_shutdown_drain_seconds)
+
+            dispatcher.startup.register(start_broadcast_dispatcher)
+            dispatcher.shutdown.register(stop_broadcast_dispatcher)
+
         # --- Bot Start ---
-        await bot.delete_webhook(drop_pending_updates=True)
-        logging.info("Starting polling...")
-        await dispatcher.start_polling(bot)
+        if settings.bot_mode == 'polling':
+            await bot.delete_webhook(drop_pending_updates=True)
+
+        background_tasks: list[asyncio.Task] = []
+        if snapshot_store:
+            background_tasks.append(asyncio.create_task(
+                snapshot_store.run_periodically(settings.cache_snapshot_interval_seconds)
+            ))
+        if settings.metrics_log_interval_seconds > 0:
+            background_tasks.append(asyncio.create_task(
+                metrics.run_periodically(settings.metrics_log_interval_seconds)
+            ))
+
+        try:
+            if settings.bot_mode == 'webhook':
+                # Наявність обох значень у режимі вебхука гарантує Settings.check_webhook_settings.
+                webhook_base_url, webhook_secret = settings.webhook_base_url, settings.webhook_secret
+                assert webhook_base_url and webhook_secret
+                logging.info("Starting webhook server...")
+                await run_webhook(
+                    dispatcher,
+                    bot,
+                    base_url=webhook_base_url,
+                    path=settings.webhook_path,
+                    secret_token=webhook_secret,
+                    host=settings.webhook_host,
+                    port=settings.webhook_port
+                )
+            else:
+                logging.info("Starting polling...")
+                await dispatcher.start_polling(bot)
+        finally:
+            for task in background_tasks:
+                task.cancel()
+            await asyncio.gather(*background_tasks, return_exceptions=True)
+            metrics.log()
+
+            if snapshot_store:
+                saved = await snapshot_store.save()
+                logging.info("Saved %d cache entries to %s", saved, settings.cache_snapshot_path)
+
+            await storage.close()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+for name, value in {
+    'TELEGRAM_BOT_TOKEN': '1:test', 'API_BASE_URL': 'http://localhost', 'API_KEY': 'test', 'ADMIN_API_KEY': 'test'
+}.items():
+    os.environ.setdefault(name, value)
+
+from api import WeeklyScheduleDTO  # noqa: E402
+from application.services.schedule import TODAY_SCHEDULE_TTL_SECONDS, ScheduleService  # noqa: E402
+from application.snapshot import CacheSnapshotStore  # noqa: E402
+
+TIME_ZONE_ID = "Europe/Kyiv"
+
+
+def make_week(week_start: date) -> WeeklyScheduleDTO:
+    days = [
+        {
+            "date": (week_start + timedelta(days=i)).isoformat(), "dayOfWeekName": "день",
+            "dayOfWeekAbbreviation": "д", "weekNumber": 1, "isEvenWeek": False, "groupName": "G", "lessons": []
+        }
+        for i in range(5)
+    ]
+    return WeeklyScheduleDTO.model_validate({
+        "weekStartDate": week_start.isoformat(), "weekEndDate": (week_start + timedelta(days=6)).isoformat(),
+        "weekNumber": 1, "isEvenWeek": False, "groupName": "G", "timeZoneId": TIME_ZONE_ID,
+        "dailySchedules": days,
+    })
+
+
+def make_service() -> ScheduleService:
+    return ScheduleService(MagicMock(), MagicMock(), MagicMock())
+
+
+class ScheduleSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "snapshot.jsonl")
+        today = date.today()
+        self.week_start = today - timedelta(days=today.weekday())
+
+    def save_snapshot(self, age_seconds: float) -> None:
+        service = make_service()
+        service._store_week(1, TIME_ZONE_ID, make_week(self.week_start), ttl=TODAY_SCHEDULE_TTL_SECONDS)
+        asyncio.run(CacheSnapshotStore(self.path, service.snapshot_sections()).save())
+
+        with open(self.path, encoding='utf-8') as f:
+            header, *records = f.read().splitlines()
+        header_data = json.loads(header)
+        header_data['saved_at'] -= age_seconds
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("\n".join([json.dumps(header_data), *records]) + "\n")
+
+    def test_expired_week_is_not_restored(self):
+        self.save_snapshot(age_seconds=TODAY_SCHEDULE_TTL_SECONDS + 60)
+
+        service = make_service()
+        CacheSnapshotStore(self.path, service.snapshot_sections()).load()
+
+        self.assertEqual(service._weekly_cache.entries(), [])
+        self.assertEqual(service._daily_cache.entries(), [])
+
+    def test_week_is_restored_with_remaining_ttl(self):
+        self.save_snapshot(age_seconds=60)
+
+        service = make_service()
+        CacheSnapshotStore(self.path, service.snapshot_sections()).load()
+
+        weekly_ttls = [ttl for _, _, ttl in service._weekly_cache.entries()]
+        daily_ttls = [ttl for _, _, ttl in service._daily_cache.entries()]
+        self.assertEqual(len(weekly_ttls), 7)
+        self.assertEqual(len(daily_ttls), 5)
+        for ttl in weekly_ttls + daily_ttls:
+            self.assertLessEqual(ttl, TODAY_SCHEDULE_TTL_SECONDS - 60 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()